@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Benchmark the installer and validator against synthetic repositories.
+
+Generates a repository and install target of configurable size, then times
+Installer.do_install, create_backup, restore_backup, verify_install, the batched
+hook merge and validate_all (sequential, process-pool and warm-cache) against them.
+
+Usage:
+    ./scripts/benchmark.py                          # Run with default sizes
+    ./scripts/benchmark.py --skills 5000 --settings-mb 4 --backups 20
+    ./scripts/benchmark.py --only install,backup    # Run selected benchmarks
+    ./scripts/benchmark.py --save-baseline          # Record results as the baseline
+    ./scripts/benchmark.py --compare                # Fail if slower than the baseline
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import install  # noqa: E402
+import validate  # noqa: E402
+from install import Colors, color  # noqa: E402
+
+BASELINE_PATH = Path(__file__).parent.parent / '.cache' / 'benchmarks' / 'baseline.json'
+
+# Options that size the synthetic repository; a baseline only compares at the same sizes
+SIZE_OPTIONS = ('skills', 'agents', 'commands', 'hooks', 'mcp', 'settings_mb', 'filter_items', 'backups')
+
+# Settings for the regression check
+DEFAULT_THRESHOLD = 1.25
+
+
+def generate_repo(root: Path, skills: int, agents: int, commands: int, hooks: int, mcp: int) -> Path:
+    """Write a synthetic extensions repository with a matching catalog.json."""
+    catalog = {
+        'version': '1.0.0',
+        'components': {'skills': [], 'agents': [], 'hooks': [], 'commands': [],
+                       'mcp': {'claude-code': [], 'claude-desktop': []}},
+        'presets': [],
+    }
+
+    for i in range(skills):
+        skill_id = f"skill-{i:05d}"
+        skill_dir = root / 'skills' / skill_id
+        (skill_dir / 'reference').mkdir(parents=True)
+        (skill_dir / 'SKILL.md').write_text(
+            f"---\nname: {skill_id}\ndescription: Synthetic skill {i} for benchmarking installs\n"
+            f"allowed-tools: Bash, Read, Grep\n---\n\n# Skill {i}\n\n" + "Guidance line.\n" * 40)
+        (skill_dir / 'README.md').write_text(f"# {skill_id}\n\nSynthetic skill.\n")
+        (skill_dir / 'reference' / 'notes.md').write_text("Reference material.\n" * 20)
+        catalog['components']['skills'].append({
+            'id': skill_id, 'name': f"Skill {i}", 'description': f"Synthetic skill {i}",
+            'path': f"skills/{skill_id}", 'tags': [f"tag-{i % 50}", 'synthetic'], 'version': '1.0.0',
+        })
+
+    for kind, count, section in (('agent', agents, 'agents'), ('command', commands, 'commands')):
+        (root / section).mkdir(parents=True)
+        for i in range(count):
+            component_id = f"{kind}-{i:05d}"
+            header = f"name: {component_id}\nmodel: sonnet\n" if kind == 'agent' else ''
+            (root / section / f"{component_id}.md").write_text(
+                f"---\n{header}description: Synthetic {kind} {i}\n---\n\n# {component_id}\n\n"
+                + "Detailed instructions for the synthetic component.\n" * 10)
+            catalog['components'][section].append({
+                'id': component_id, 'name': f"{kind.title()} {i}", 'description': f"Synthetic {kind} {i}",
+                'path': f"{section}/{component_id}.md", 'tags': [f"tag-{i % 50}"], 'version': '1.0.0',
+            })
+
+    for i in range(hooks):
+        hook_id = f"hook-{i:04d}"
+        hook_dir = root / 'hooks' / hook_id
+        hook_dir.mkdir(parents=True)
+        (hook_dir / 'README.md').write_text(
+            f"# {hook_id}\n\n## Security Disclosure\n\n**Security Level:** LOW\n\n"
+            f"**Commands executed:**\n```bash\necho {hook_id}\n```\n")
+        (hook_dir / 'settings.json').write_text(json.dumps({'hooks': {'PostToolUse': [{
+            'matcher': 'Edit|Write' if i % 2 else 'Bash',
+            'hooks': [{'type': 'command', 'command': f"echo {hook_id}"}],
+        }]}}, indent=2))
+        catalog['components']['hooks'].append({
+            'id': hook_id, 'name': f"Hook {i}", 'description': f"Synthetic hook {i}",
+            'path': f"hooks/{hook_id}", 'securityLevel': 'LOW', 'tags': ['synthetic'], 'version': '1.0.0',
+        })
+
+    for platform in ('claude-code', 'claude-desktop'):
+        (root / 'mcp' / platform).mkdir(parents=True)
+        for i in range(mcp):
+            preset_id = f"mcp-{i:04d}"
+            servers = {f"server-{i}-{j}": {'command': 'npx', 'args': [f"@example/server-{j}"]} for j in range(4)}
+            (root / 'mcp' / platform / f"{preset_id}.json").write_text(json.dumps({'mcpServers': servers}, indent=2))
+            catalog['components']['mcp'][platform].append({
+                'id': preset_id, 'name': f"MCP {i}", 'description': f"Synthetic MCP preset {i}",
+                'path': f"mcp/{platform}/{preset_id}.json", 'servers': list(servers), 'version': '1.0.0',
+            })
+
+    components = catalog['components']
+    full = {
+        'id': 'full', 'name': 'Full', 'description': 'Everything',
+        'skills': [c['id'] for c in components['skills']],
+        'agents': [c['id'] for c in components['agents']],
+        'hooks': [c['id'] for c in components['hooks']],
+        'commands': [c['id'] for c in components['commands']],
+        'mcp': [c['id'] for c in components['mcp']['claude-code']],
+    }
+    catalog['presets'].append(full)
+    (root / 'presets' / 'full').mkdir(parents=True)
+    manifest = {k: v for k, v in full.items() if k not in ('id', 'name')}
+    (root / 'presets' / 'full' / 'manifest.json').write_text(json.dumps(dict(name='full', **manifest), indent=2))
+    (root / 'catalog.json').write_text(json.dumps(catalog, indent=2))
+    return root
+
+
+def write_large_settings(target_dir: Path, size_mb: float):
+    """Write a settings.json of roughly size_mb with many unrelated handlers."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    handler = {'type': 'command', 'command': 'echo ' + 'x' * 200}
+    count = max(1, int(size_mb * 1024 * 1024 / 260))
+    settings = {
+        'permissions': {'allow': [f"Bash(tool-{i}:*)" for i in range(100)]},
+        'hooks': {'PreToolUse': [{'matcher': f"Tool{i}", 'hooks': [dict(handler, command=f"{handler['command']} {i}")]}
+                                 for i in range(count)]},
+    }
+    (target_dir / 'settings.json').write_text(json.dumps(settings, indent=2))
+
+
+def count_files(path: Path) -> int:
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def read_io_counters() -> Optional[Dict[str, int]]:
+    """Return read/write syscall counters for this process (Linux only)."""
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(': ') for line in f.read().splitlines())
+        return {'syscr': int(counters['syscr']), 'syscw': int(counters['syscw'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class Benchmark:
+    """One timed operation; setup() runs untimed before every repetition."""
+
+    def __init__(self, name: str, setup: Callable[[], Dict], run: Callable[[Dict], None],
+                 files_root: Optional[Callable[[Dict], Path]] = None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.files_root = files_root
+
+    def measure(self, repeat: int) -> Dict:
+        """Return the best wall time, peak Python memory and I/O counts."""
+        walls = []
+        syscalls = None
+        files = None
+        for _ in range(repeat):
+            context = self.setup()
+            before = read_io_counters()
+            start = time.perf_counter()
+            self.run(context)
+            walls.append(time.perf_counter() - start)
+            after = read_io_counters()
+            if before and after:
+                syscalls = {key: after[key] - before[key] for key in before}
+            if self.files_root:
+                files = count_files(self.files_root(context))
+
+        # Peak memory in a separate run, so tracing does not skew the timings
+        context = self.setup()
+        tracemalloc.start()
+        self.run(context)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'wall_s': min(walls),
+            'peak_mb': peak / (1024 * 1024),
+            'read_syscalls': syscalls['syscr'] if syscalls else None,
+            'write_syscalls': syscalls['syscw'] if syscalls else None,
+            'files': files,
+        }
+
+
+def build_benchmarks(repo: Path, work: Path, args: argparse.Namespace) -> List[Benchmark]:
+    """Define the benchmarks over a generated repo, using work for targets."""
+    index = install.CatalogIndex.load(repo / 'catalog.json', repo / '.cache')
+    counter = iter(range(1_000_000))
+
+    def installer(**options) -> install.Installer:
+        inst = install.Installer(repo, index)
+        inst.load_preset('full')
+        for key, value in options.items():
+            setattr(inst, key, value)
+        return inst
+
+    def fresh_target() -> Path:
+        target = work / f"target-{next(counter)}" / '.claude'
+        target.mkdir(parents=True)
+        return target
+
+    # A populated target with history, shared by the backup/restore benchmarks
+    populated = fresh_target()
+    write_large_settings(populated, args.settings_mb)
+    seeded = installer(no_backup=True, jobs=args.jobs)
+    seeded.do_install(populated, 'project', 'copy')
+    for i in range(args.backups):
+        (populated / 'skills' / 'skill-00000' / 'SKILL.md').write_text(f"revision {i}\n")
+        installer().create_backup(populated, keep=args.backups)
+    seeded_backups = len(seeded.list_backups(populated))
+    if seeded_backups != args.backups:
+        raise RuntimeError(f"seeded {seeded_backups} backups instead of {args.backups}")
+
+    def install_setup() -> Dict:
+        return {'target': fresh_target(), 'installer': installer(no_backup=True, jobs=args.jobs)}
+
+    def reinstall_setup() -> Dict:
+        return {'target': populated, 'installer': installer(no_backup=True, jobs=args.jobs)}
+
+    def hook_setup() -> Dict:
+        target = fresh_target()
+        write_large_settings(target, args.settings_mb)
+        return {'target': target, 'installer': installer()}
+
+    def restore_setup() -> Dict:
+        # Restore into a copy, so the later benchmarks on populated do not
+        # depend on whether restore ran before them
+        project = work / f"target-{next(counter)}"
+        shutil.copytree(populated.parent, project, symlinks=True)
+        target = project / '.claude'
+        inst = installer()
+        backup = inst.list_backups(target)[0].backup_id
+        return {'target': target, 'installer': inst, 'backup': backup}
+
+    # Catalog entries repeated up to --filter-items, as the interactive menu would index them
+    entries = [entry for section in index.sections.values() for entry in section]
+    haystacks = [f"{i} " + install.component_haystack(entries[i % len(entries)])
+                 for i in range(args.filter_items)]
+
+    def filter_setup() -> Dict:
+        return {'filter': install.FuzzyFilter(haystacks)}
+
+    markdown = sorted(repo.glob('skills/*/SKILL.md')) + sorted(repo.glob('agents/*.md')) + sorted(repo.glob('commands/*.md'))
+
+    def warm_cache_setup() -> Dict:
+        cache_path = work / 'validation.json'
+        if not cache_path.exists():
+            # Age the sources so their stats are trusted, then fill the cache
+            past = time.time() - 60
+            for dirpath, _, filenames in os.walk(repo):
+                for filename in filenames:
+                    os.utime(os.path.join(dirpath, filename), (past, past))
+            validate.validate_all(repo, cache=validate.ValidationCache(cache_path))
+        return {'cache': cache_path}
+
+    return [
+        Benchmark('install', install_setup,
+                  lambda c: c['installer'].do_install(c['target'], 'project', 'copy'),
+                  lambda c: c['target']),
+        Benchmark('reinstall-unchanged', reinstall_setup,
+                  lambda c: c['installer'].do_install(c['target'], 'project', 'copy')),
+        # Rotation keeps --backups, so every repetition sees the same history
+        Benchmark('backup', lambda: {'target': populated, 'installer': installer()},
+                  lambda c: c['installer'].create_backup(c['target'], keep=max(1, args.backups)),
+                  lambda c: c['target'] / '.backups'),
+        Benchmark('restore', restore_setup,
+                  lambda c: c['installer'].restore_backup(c['target'], backup_id=c['backup'])),
+        Benchmark('verify', lambda: {'target': populated, 'installer': installer()},
+                  lambda c: c['installer'].verify_install(c['target'])),
+        Benchmark('hook-merge', hook_setup,
+                  lambda c: c['installer'].install_hooks(sorted(c['installer'].selected_hooks), c['target'])),
+        Benchmark('filter-keystroke', filter_setup,
+                  # The first keystroke is the worst case: every entry is still a candidate
+                  lambda c: (c['filter'].push('s'), c['filter'].matches)),
+        Benchmark('frontmatter', lambda: {'paths': markdown},
+                  lambda c: [validate.read_frontmatter(path) for path in c['paths']]),
+        Benchmark('schema-catalog', lambda: {'catalog': json.loads((repo / 'catalog.json').read_text())},
+                  lambda c: validate.schema_errors(validate.check_catalog, c['catalog'], repo / 'catalog.json')),
+        Benchmark('validate', lambda: {},
+                  lambda c: validate.validate_all(repo)),
+        Benchmark('validate-parallel', lambda: {},
+                  lambda c: validate.validate_all(repo, jobs=0)),
+        Benchmark('validate-warm', warm_cache_setup,
+                  lambda c: validate.validate_all(repo, cache=validate.ValidationCache(c['cache']))),
+    ]
+
+
+def print_results(results: Dict[str, Dict], baseline: Optional[Dict[str, Dict]], threshold: float) -> List[str]:
+    """Print a results table; return the names of regressed benchmarks."""
+    print(color("\nBenchmark Results", Colors.BLUE + Colors.BOLD))
+    print("-" * 40)
+    print(f"  {'benchmark':<22} {'wall ms':>10} {'peak MB':>9} {'reads':>8} {'writes':>8} {'files':>8}  vs baseline")
+
+    regressions = []
+    for name, result in results.items():
+        line = (f"  {name:<22} {result['wall_s'] * 1000:>10.1f} {result['peak_mb']:>9.1f} "
+                f"{result['read_syscalls'] if result['read_syscalls'] is not None else '-':>8} "
+                f"{result['write_syscalls'] if result['write_syscalls'] is not None else '-':>8} "
+                f"{result['files'] if result['files'] is not None else '-':>8}")
+        if baseline and name in baseline:
+            ratio = result['wall_s'] / max(baseline[name]['wall_s'], 1e-9)
+            ratio_color = Colors.RED if ratio > threshold else Colors.GREEN
+            line += "  " + color(f"{ratio:.2f}x", ratio_color)
+            if ratio > threshold:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark install.py and validate.py on synthetic repositories')
+    parser.add_argument('--skills', type=int, default=500, help='Number of synthetic skills')
+    parser.add_argument('--agents', type=int, default=200, help='Number of synthetic agents')
+    parser.add_argument('--commands', type=int, default=200, help='Number of synthetic commands')
+    parser.add_argument('--hooks', type=int, default=40, help='Number of synthetic hooks')
+    parser.add_argument('--mcp', type=int, default=10, help='Number of synthetic MCP presets per platform')
+    parser.add_argument('--settings-mb', type=float, default=2.0, dest='settings_mb',
+                        help='Size of the pre-existing settings.json in the target')
+    parser.add_argument('--filter-items', type=int, default=10000, dest='filter_items',
+                        help='Catalog size for the interactive filter benchmark')
+    parser.add_argument('--backups', type=int, default=12, help='Backups to create before timing')
+    parser.add_argument('--jobs', type=int, default=install.DEFAULT_JOBS, help='Installer worker threads')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetitions per benchmark (best is kept)')
+    parser.add_argument('--only', type=str, help='Comma-separated benchmarks to run')
+    parser.add_argument('--save-baseline', action='store_true', dest='save_baseline',
+                        help=f'Save results as the local baseline ({BASELINE_PATH})')
+    parser.add_argument('--compare', action='store_true',
+                        help='Exit non-zero if a benchmark is slower than the baseline by --threshold')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Allowed slowdown ratio for --compare (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated repository and targets')
+    args = parser.parse_args()
+
+    sizes = {key: getattr(args, key) for key in SIZE_OPTIONS}
+    baseline = None
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH) as f:
+            saved_baseline = json.load(f)
+        if saved_baseline.get('sizes') == sizes:
+            baseline = saved_baseline.get('results')
+        else:
+            differences = ', '.join(
+                f"{key} {saved_baseline.get('sizes', {}).get(key, '?')} -> {value}"
+                for key, value in sizes.items() if saved_baseline.get('sizes', {}).get(key) != value)
+            if args.compare:
+                print(color(f"Baseline was recorded with different sizes ({differences}); "
+                            "re-run --save-baseline with these sizes before --compare", Colors.RED))
+                sys.exit(2)
+            print(color(f"Ignoring baseline recorded with different sizes ({differences})", Colors.YELLOW))
+
+    work = Path(tempfile.mkdtemp(prefix='claude-extensions-bench-'))
+    try:
+        print(f"Generating synthetic repository in {work} ...")
+        repo = generate_repo(work / 'repo', args.skills, args.agents, args.commands, args.hooks, args.mcp)
+        benchmarks = build_benchmarks(repo, work, args)
+        if args.only:
+            selected = set(args.only.split(','))
+            benchmarks = [b for b in benchmarks if b.name in selected]
+
+        results = {}
+        for benchmark in benchmarks:
+            print(f"  running {benchmark.name} ...")
+            results[benchmark.name] = benchmark.measure(max(1, args.repeat))
+    finally:
+        if args.keep:
+            print(f"Kept benchmark files in {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        saved = dict(baseline or {})
+        saved.update(results)
+        install.write_json_file(BASELINE_PATH, {'sizes': sizes, 'results': saved})
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+
+    if args.compare:
+        if baseline is None:
+            print(color("\nNo baseline to compare against; run with --save-baseline first", Colors.YELLOW))
+        elif regressions:
+            print(color(f"\nRegressions (>{args.threshold:.2f}x baseline): {', '.join(regressions)}", Colors.RED))
+            sys.exit(1)
+        else:
+            print(color("\nNo regressions against baseline", Colors.GREEN))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Compile catalog.json from the component tree.
+
+Walks skills/, agents/, commands/, hooks/ and mcp/ once, hashing every
+component and extracting what the installer needs from its sources: agent
+models, hook security levels and command listings, MCP server names. Content
+hashes are kept in .cache/catalog-build.json, not in catalog.json, and only
+entries whose hash changed since the last local build are re-parsed. Curated
+fields (name, description, tags, version) and presets are kept as written;
+new components get defaults from their frontmatter.
+
+Usage:
+    ./scripts/build_catalog.py           # Update catalog.json in place
+    ./scripts/build_catalog.py --check   # Exit 1 if catalog.json is out of date (for CI)
+    ./scripts/build_catalog.py --force   # Re-parse every component
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from install import Colors, color, hash_source  # noqa: E402
+from validate import read_frontmatter  # noqa: E402
+
+REPO_DIR = Path(__file__).parent.parent
+
+# Content hash and compiled entry of each component at the last local build
+BUILD_CACHE = Path('.cache') / 'catalog-build.json'
+
+# Field order of compiled entries; anything else is kept after these
+FIELD_ORDER = ['id', 'name', 'description', 'path', 'model', 'securityLevel', 'servers', 'tags', 'version',
+               'commands']
+
+# Lists of scalars up to this width stay on one line, as in the hand-written catalog
+INLINE_WIDTH = 100
+
+
+def discover(repo_dir: Path) -> Dict[str, List[Tuple[str, str]]]:
+    """Return (id, repo-relative path) of every component, keyed by section."""
+    found: Dict[str, List[Tuple[str, str]]] = {}
+
+    def collect(section: str, paths: List[Path], ident):
+        found[section] = [(ident(p), p.relative_to(repo_dir).as_posix()) for p in sorted(paths)]
+
+    collect('skills', [p for p in (repo_dir / 'skills').glob('*/') if (p / 'SKILL.md').exists()],
+            lambda p: p.name)
+    for section in ('agents', 'commands'):
+        collect(section, [p for p in (repo_dir / section).glob('*.md') if p.name != 'README.md'],
+                lambda p: p.stem)
+    collect('hooks', [p for p in (repo_dir / 'hooks').glob('*/') if (p / 'settings.json').exists()],
+            lambda p: p.name)
+    for platform in ('claude-code', 'claude-desktop'):
+        collect(f"mcp/{platform}", list((repo_dir / 'mcp' / platform).glob('*.json')), lambda p: p.stem)
+    return found
+
+
+def hook_commands(readme: str) -> List[str]:
+    """Return the lines of the code block following "Commands executed:"."""
+    start = readme.find("Commands executed:")
+    if start == -1:
+        return []
+    code_start = readme.find("```", start)
+    code_end = readme.find("```", code_start + 3)
+    if code_start == -1 or code_end == -1:
+        return []
+    code = readme[code_start + 3:code_end]
+    # Drop the fence's language tag
+    code = code.split("\n", 1)[1] if "\n" in code else ""
+    return code.strip().split("\n") if code.strip() else []
+
+
+def security_level(readme: str) -> Optional[str]:
+    """Return the level from a hook README's "**Security Level:**" line."""
+    match = re.search(r"\*\*Security Level:\*\*\s*([A-Z]+)", readme)
+    return match.group(1) if match else None
+
+
+def first_sentence(text: str) -> str:
+    """Shorten a frontmatter description to a catalog one-liner."""
+    text = " ".join(str(text).split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    return (match.group(1) if match else text).rstrip(".")
+
+
+def title_from_id(component_id: str) -> str:
+    return " ".join(word.capitalize() for word in component_id.split("-"))
+
+
+def compile_entry(section: str, component_id: str, rel_path: str,
+                  existing: Optional[Dict], repo_dir: Path) -> Dict:
+    """Build a catalog entry from its sources.
+
+    Derived fields are refreshed; curated fields are taken from the existing
+    entry, or defaulted from the sources for a new component.
+    """
+    source = repo_dir / rel_path
+    entry = dict(existing or {})
+    entry.update(id=component_id, path=rel_path)
+    # Written by earlier versions of this tool
+    entry.pop('hash', None)
+    defaults: Dict = {'name': title_from_id(component_id)}
+
+    if section in ('skills', 'agents', 'commands'):
+        markdown = source / 'SKILL.md' if section == 'skills' else source
+        metadata = read_frontmatter(markdown)
+        metadata = metadata or {}
+        if metadata.get('description'):
+            defaults['description'] = first_sentence(metadata['description'])
+        defaults['version'] = str(metadata.get('version', '1.0.0'))
+        if section == 'agents' and metadata.get('model'):
+            entry['model'] = metadata['model']
+    elif section == 'hooks':
+        readme_path = source / 'README.md'
+        readme = readme_path.read_text() if readme_path.exists() else ""
+        level = security_level(readme)
+        if level:
+            entry['securityLevel'] = level
+        entry['commands'] = hook_commands(readme)
+        overview = re.search(r"## Overview\s*\n\s*\n?(.+)", readme)
+        if overview:
+            defaults['description'] = first_sentence(overview.group(1))
+    else:
+        config = json.loads(source.read_text())
+        entry['servers'] = list(config.get('mcpServers', {}))
+        defaults['description'] = ", ".join(entry['servers'])
+
+    if existing is None:
+        defaults.setdefault('description', "")
+        defaults.setdefault('version', '1.0.0')
+        defaults['tags'] = []
+        entry.update(defaults)
+
+    ordered = {key: entry[key] for key in FIELD_ORDER if key in entry}
+    ordered.update((key, value) for key, value in entry.items() if key not in ordered)
+    return ordered
+
+
+def section_entries(catalog: Dict, section: str) -> List[Dict]:
+    components = catalog.setdefault('components', {})
+    if section.startswith('mcp/'):
+        return components.setdefault('mcp', {}).setdefault(section[4:], [])
+    return components.setdefault(section, [])
+
+
+def builder_version() -> str:
+    """Digest of this script; cached entries from another version are not reused."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_build_cache(path: Path) -> Dict[str, List]:
+    """Return the last build's [digest, entry] per component, or nothing if stale."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != builder_version():
+        return {}
+    return data.get('entries', {})
+
+
+def save_build_cache(path: Path, entries: Dict[str, List]):
+    """Write the build cache; a failed write only costs a full re-parse next time."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'version': builder_version(), 'entries': entries}))
+    except OSError:
+        pass
+
+
+def build(catalog: Dict, repo_dir: Path, force: bool = False,
+          cache: Optional[Dict[str, List]] = None) -> Tuple[Dict, Dict[str, List[str]]]:
+    """Return the compiled catalog and the ids added, updated and removed.
+
+    cache maps "section/id" to the component's [digest, compiled entry] at
+    the last build. An entry is only re-parsed when its sources or its
+    catalog entry differ from that; cache is updated in place.
+    """
+    changes: Dict[str, List[str]] = {'added': [], 'updated': [], 'removed': []}
+    compiled = json.loads(json.dumps(catalog))
+    if cache is None:
+        cache = {}
+    built = set()
+
+    for section, components in discover(repo_dir).items():
+        entries = section_entries(compiled, section)
+        existing = {entry['id']: entry for entry in entries}
+        result = []
+        for component_id, rel_path in components:
+            key = f"{section}/{component_id}"
+            built.add(key)
+            digest, _ = hash_source(repo_dir / rel_path)
+            old = existing.pop(component_id, None)
+            if old is not None and cache.get(key) == [digest, old] and not force:
+                result.append(old)
+                continue
+            entry = compile_entry(section, component_id, rel_path, old, repo_dir)
+            cache[key] = [digest, entry]
+            result.append(entry)
+            if old is None:
+                changes['added'].append(f"{section}/{component_id}")
+            elif entry != old:
+                changes['updated'].append(f"{section}/{component_id}")
+        changes['removed'].extend(f"{section}/{component_id}" for component_id in existing)
+
+        # Keep the curated order, with new components at the end
+        position = {entry['id']: i for i, entry in enumerate(entries)}
+        result.sort(key=lambda entry: position.get(entry['id'], len(position)))
+        entries[:] = result
+
+    for key in set(cache) - built:
+        del cache[key]
+
+    if any(changes.values()):
+        compiled['lastUpdated'] = date.today().isoformat()
+    return compiled, changes
+
+
+def dump_catalog(value, indent: int = 0) -> str:
+    """Serialize like json.dumps(indent=2), keeping short scalar lists on one line."""
+    pad = "  " * (indent + 1)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = [f"{pad}{json.dumps(key)}: {dump_catalog(item, indent + 1)}" for key, item in value.items()]
+        return "{\n" + ",\n".join(items) + "\n" + "  " * indent + "}"
+    if isinstance(value, list):
+        inline = json.dumps(value, ensure_ascii=False)
+        if not any(isinstance(item, (dict, list)) for item in value) and len(pad) + len(inline) <= INLINE_WIDTH:
+            return inline
+        return "[\n" + ",\n".join(pad + dump_catalog(item, indent + 1) for item in value) + "\n" + "  " * indent + "]"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile catalog.json from the component tree')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if catalog.json is out of date')
+    parser.add_argument('--force', action='store_true', help='Re-parse every component')
+    parser.add_argument('--catalog', type=Path, default=REPO_DIR / 'catalog.json', help='Catalog to update')
+    args = parser.parse_args()
+
+    catalog = json.loads(args.catalog.read_text()) if args.catalog.exists() else {
+        'version': '1.0.0', 'components': {}, 'presets': []}
+    cache = load_build_cache(REPO_DIR / BUILD_CACHE)
+    compiled, changes = build(catalog, REPO_DIR, force=args.force, cache=cache)
+    save_build_cache(REPO_DIR / BUILD_CACHE, cache)
+    output = dump_catalog(compiled) + "\n"
+
+    for kind, ids in changes.items():
+        for component in ids:
+            print(f"  {kind:<8} {component}")
+
+    current = args.catalog.read_text() if args.catalog.exists() else ""
+    if args.check:
+        if any(changes.values()) or output != current:
+            print(color("catalog.json is out of date. Run ./scripts/build_catalog.py and commit the result.",
+                        Colors.RED))
+            sys.exit(1)
+        print(color("catalog.json is up to date.", Colors.GREEN))
+        return
+
+    if output == current:
+        print(color("catalog.json is up to date.", Colors.GREEN))
+        return
+    args.catalog.write_text(output)
+    print(color(f"Wrote {args.catalog}", Colors.GREEN))
+
+
+if __name__ == '__main__':
+    main()
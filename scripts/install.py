@@ -2,22 +2,66 @@
 """
 Claude Code Community Extensions - Interactive TUI Installer
 
+Installer is a side-effect-free library (results, never prints or exits);
+InstallerTUI is the command-line front end used below.
+
 Usage:
     ./scripts/install.py                    # Interactive mode
     ./scripts/install.py --list             # List all components
+    ./scripts/install.py --search TAG/TEXT  # Find components by tag or text
     ./scripts/install.py --preset NAME      # Install preset
+    ./scripts/install.py --preset NAME --plan  # Show what an install would change
+    ./scripts/install.py --fleet FILE       # Install into every project in a lockfile
+    ./scripts/install.py --verify           # Check installed components for drift
+    ./scripts/install.py --repair           # Reinstall only drifted components
+    ./scripts/install.py --watch            # Sync repo edits into copy-mode installs
+    ./scripts/install.py --update-from REV  # Reinstall what changed since REV (see update.sh)
     ./scripts/install.py --restore          # Restore from backup
+    ./scripts/install.py --restore ID       # Restore a backup by id (or "latest") without prompting
+    ./scripts/install.py --preset NAME --timings --trace FILE  # Profile an install
     ./scripts/install.py --help             # Show help
 """
 
 import argparse
+import bisect
+import copy
+import ctypes
+import ctypes.util
+import hashlib
+import io
 import json
 import os
+import pickle
+import platform
+import re
+import select
 import shutil
+import stat
+import struct
+import subprocess
 import sys
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: config writes stay atomic, but are not locked
+    fcntl = None
+
+try:
+    import curses
+except ImportError:
+    # Windows without windows-curses: the line-based menus are used
+    curses = None
 
 # ANSI color codes
 class Colors:
@@ -39,14 +83,1178 @@ def color(text: str, color_code: str) -> str:
 
 def clear_screen():
     """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt':
+        os.system('cls')
+    else:
+        # ANSI home + erase display, without forking a shell for clear(1)
+        sys.stdout.write('\033[H\033[2J')
+        sys.stdout.flush()
+
+
+# Directories and config files captured by a backup, keyed by their name
+# inside the backup.
+BACKUP_SUBDIRS = ['skills', 'agents', 'commands', 'hooks']
+BACKUP_KEEP = 5
+
+# Component kinds in the order they are installed and reported.
+COMPONENT_KINDS = ['skill', 'agent', 'command', 'hook', 'mcp']
+
+COMPONENT_LABELS = {
+    'skill': 'skill',
+    'agent': 'agent',
+    'command': 'command',
+    'hook': 'hook',
+    'mcp': 'MCP preset',
+}
+
+# Default worker count for the install pool; installs are I/O bound.
+DEFAULT_JOBS = min(8, (os.cpu_count() or 1) * 2)
+
+
+# Install modes. Everything but symlink gives the target its own files.
+INSTALL_MODES = ['symlink', 'copy', 'hardlink', 'reflink']
+
+# ioctl request to clone a file's extents (Linux FICLONE = _IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# Per-target record of what the installer put there, next to the components.
+INSTALL_STATE_FILE = '.install-state.json'
+INSTALL_STATE_VERSION = 1
+
+# Lock files for a target's read-modify-writes, inside the installer's own
+# backup directory so none are left next to the user's config files.
+LOCKS_DIR = Path('.backups') / 'locks'
+
+
+@dataclass
+class ComponentResult:
+    """Outcome of installing a single component."""
+    kind: str
+    component_id: str
+    status: str  # 'installed', 'unchanged', 'missing' or 'failed'
+    detail: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('installed', 'unchanged')
+
+
+@dataclass
+class PlanEntry:
+    """What an install would do to one selected component."""
+    kind: str
+    component_id: str
+    action: str  # 'install', 'update', 'unchanged' or 'missing'
+    reason: str = ''
+    state: Optional[Dict] = None
+
+
+@dataclass
+class VerifyResult:
+    """Drift of one recorded component from what was installed."""
+    kind: str
+    component_id: str
+    status: str  # 'ok', 'missing', 'dangling', 'modified' or 'outdated'
+    reason: str = ''
+    mode: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of installing into one project of a fleet lockfile."""
+    path: Path
+    seconds: float
+    results: List[ComponentResult]
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and all(r.ok for r in self.results)
+
+
+@dataclass
+class InstallReport:
+    """Outcome of one install into a target."""
+    target_dir: Path
+    target_type: str
+    mode: str
+    results: List[ComponentResult]
+    backup: Optional[Path] = None
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+
+@dataclass
+class UpdateReport:
+    """Outcome of reinstalling what changed between two revisions."""
+    since: str
+    changed_paths: List[str]
+    affected: List[Tuple[str, str]]  # (catalog section, id)
+    targets: List[Path]
+    reports: List[InstallReport] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.reports)
+
+
+@dataclass
+class BackupInfo:
+    """A backup of a target, as listed by Installer.list_backups."""
+    backup_id: str
+    path: Path
+    format: str  # 'store', 'archive' or 'legacy'
+
+    @classmethod
+    def from_path(cls, path: Path) -> 'BackupInfo':
+        if path.is_dir():
+            backup_format = 'legacy'
+        elif BackupStore.is_archive(path):
+            backup_format = 'archive'
+        else:
+            backup_format = 'store'
+        return cls(BackupStore.backup_id(path), path, backup_format)
+
+
+@dataclass
+class RestoreResult:
+    """Outcome of restoring a backup."""
+    backup_id: str
+    path: Optional[Path]
+    restored: List[str]  # backed-up roots, directories with a trailing '/'
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass
+class SyncResult:
+    """One file (or failed component) synced into a target by sync_changes."""
+    kind: str
+    component_id: str
+    target_dir: Path
+    path: str
+    error: str = ''
+
+
+@dataclass
+class ComponentInfo:
+    """A catalog entry, as returned by list_components and search_components."""
+    section: str
+    id: str
+    name: str
+    description: str
+    path: str
+    version: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    security_level: Optional[str] = None
+
+    @classmethod
+    def from_entry(cls, section: str, entry: Dict) -> 'ComponentInfo':
+        return cls(section, entry['id'], entry.get('name', entry['id']), entry.get('description', ''),
+                   entry.get('path', ''), entry.get('version'), list(entry.get('tags', [])),
+                   entry.get('securityLevel'))
+
+
+class Timings:
+    """Records timed spans of install phases and components.
+
+    Disabled instances (the default) record nothing, so spans can be left in
+    hot paths. Spans from worker threads are kept with their thread id and
+    can be exported as a Chrome trace (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.spans: List[Tuple[str, str, float, float, int]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = 'phase') -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self.spans.append((name, category, start - self.origin, duration, threading.get_ident()))
+
+    def print_summary(self, top: int = 10):
+        """Print phase totals and the slowest components."""
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for name, category, _, duration, _ in sorted(self.spans, key=lambda s: s[2]):
+            if category != 'component':
+                totals.setdefault((category, name), []).append(duration)
+
+        print(color("\nTimings", Colors.BLUE + Colors.BOLD))
+        print("-" * 40)
+        print(f"  {'phase':<36} {'count':>5} {'total ms':>10}")
+        for (category, name), durations in totals.items():
+            print(f"  {name[:36]:<36} {len(durations):>5} {sum(durations) * 1000:>10.1f}")
+
+        components = [s for s in self.spans if s[1] == 'component']
+        if components:
+            total = sum(s[3] for s in components)
+            print(f"  {'components (summed across threads)':<36} {len(components):>5} {total * 1000:>10.1f}")
+            print(color("\n  Slowest components:", Colors.DIM))
+            for name, _, _, duration, _ in sorted(components, key=lambda s: s[3], reverse=True)[:top]:
+                print(f"    {name[:34]:<34} {duration * 1000:>10.1f} ms")
+
+        print(f"\n  Wall time: {(time.perf_counter() - self.origin) * 1000:.1f} ms")
+
+    def write_trace(self, path: Path):
+        """Write the spans as a Chrome trace-event JSON file."""
+        pid = os.getpid()
+        events = [
+            {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round(start * 1e6, 1),
+                'dur': round(duration * 1e6, 1),
+                'pid': pid,
+                'tid': tid,
+            }
+            for name, category, start, duration, tid in self.spans
+        ]
+        write_json_file(path, {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'host': platform.node(),
+                'python': platform.python_version(),
+                'platform': sys.platform,
+                'argv': sys.argv[1:],
+            },
+        })
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_source(path: Path) -> Tuple[str, Dict[str, str]]:
+    """Hash a component source file or directory.
+
+    Returns the combined digest and the per-file digests keyed by path
+    relative to ``path`` (a single file is keyed by its own name).
+    """
+    if path.is_file():
+        file_digest = file_sha256(path)
+        return file_digest, {path.name: file_digest}
+
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = Path(dirpath) / filename
+            if file_path.is_symlink() and not file_path.exists():
+                # A dangling link has no contents; identify it by its target
+                file_digest = hashlib.sha256(f"symlink:{os.readlink(file_path)}".encode()).hexdigest()
+            else:
+                file_digest = file_sha256(file_path)
+            files[file_path.relative_to(path).as_posix()] = file_digest
+
+    return combine_digests(files), files
+
+
+def combine_digests(files: Dict[str, str]) -> str:
+    """Combine per-file digests (keyed by relative path) into one digest."""
+    digest = hashlib.sha256()
+    for rel_path in sorted(files):
+        digest.update(f"{rel_path}\0{files[rel_path]}\n".encode())
+    return digest.hexdigest()
+
+
+def scan_files(path: Path) -> Dict[str, os.stat_result]:
+    """lstat every file under a directory (or a single file) with os.scandir.
+
+    Keys are paths relative to ``path`` as in hash_source. Symlinks are
+    reported as entries of their own and never followed.
+    """
+    if not path.is_dir() or path.is_symlink():
+        return {path.name: os.lstat(path)}
+
+    files = {}
+    pending = [(str(path), '')]
+    while pending:
+        directory, prefix = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, f"{prefix}{entry.name}/"))
+                else:
+                    files[f"{prefix}{entry.name}"] = entry.stat(follow_symlinks=False)
+    return files
+
+
+def stat_key(st: os.stat_result) -> List[int]:
+    """Return the (size, mtime, inode) triple used to detect file changes."""
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def reflink_file(src, dst):
+    """Copy src to dst, sharing storage with copy-on-write where supported.
+
+    Tries a FICLONE clone (btrfs, XFS, bcachefs, ...), then copy_file_range
+    (which can clone or copy server-side on some filesystems), and falls back
+    to a regular copy. Metadata is copied as with shutil.copy2.
+    """
+    cloned = False
+    if fcntl is not None and sys.platform.startswith('linux'):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError:
+                cloned = _copy_file_range(fsrc.fileno(), fdst.fileno())
+    if not cloned:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> bool:
+    """Copy a whole file with os.copy_file_range; False if unsupported."""
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    remaining = os.fstat(src_fd).st_size
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(src_fd, dst_fd, remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    except OSError:
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        return False
+    return remaining <= 0
+
+
+def hardlink_file(src, dst):
+    """Hardlink dst to src, copying instead across filesystems or when refused."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+# File copy function for each non-symlink install mode
+COPY_FUNCTIONS = {
+    'copy': shutil.copy2,
+    'hardlink': hardlink_file,
+    'reflink': reflink_file,
+}
+
+
+def write_json_file(path: Path, data: Dict, indent: int = 2, sort_keys: bool = False):
+    """Atomically replace path with JSON data.
+
+    The data goes to a temporary file in the same directory, is fsynced and
+    then renamed over path, so readers see either the old or the new file and
+    never a truncated one. A symlinked path is written through to its target,
+    and an existing file keeps its permissions.
+    """
+    if path.is_symlink():
+        path = Path(os.path.realpath(path))
+    try:
+        file_mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        file_mode = 0o644
+
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent, sort_keys=sort_keys)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, file_mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+@contextmanager
+def locked_file(path: Path, lock_dir: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock for a read-modify-write of path.
+
+    The lock is taken on ``<lock_dir>/<name>.lock`` (path itself is replaced
+    on every write, so it cannot carry the lock); every writer of path must
+    pass the same lock_dir. It serializes installers, in this or other
+    processes, that update the same file while leaving everything else free
+    to run in parallel.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / f"{path.name}.lock", 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def hook_fingerprint(event: str, matcher: str, handler: Dict) -> str:
+    """Return a stable identity for a hook handler."""
+    command = handler.get('command') if isinstance(handler, dict) else None
+    if command is None:
+        command = json.dumps(handler, sort_keys=True)
+    return json.dumps([event, matcher, command])
+
+
+def hook_fingerprints(settings: Dict) -> Set[str]:
+    """Return the fingerprints of every hook handler in a settings dict."""
+    return {
+        hook_fingerprint(event, group.get('matcher', ''), handler)
+        for event, groups in settings.get('hooks', {}).items()
+        for group in groups if isinstance(group, dict)
+        for handler in group.get('hooks', [])
+    }
+
+
+def hook_handlers(source: Path) -> List[str]:
+    """Return the sorted handler fingerprints a hook's settings.json defines."""
+    with open(source) as f:
+        return sorted(hook_fingerprints(json.load(f)))
+
+
+def merge_hook_settings(settings: Dict, additions: List[Dict], stale: Optional[Set[str]] = None) -> Dict:
+    """Merge hook settings files into settings without duplicating handlers.
+
+    Handlers are identified by (event, matcher, command). Duplicates already
+    present in settings are dropped as well, and handlers for a matcher that
+    already has a group are appended to that group. Existing handlers whose
+    fingerprint is in ``stale`` (what a re-merged hook used to define) are
+    removed first. settings is not modified.
+    """
+    merged = copy.deepcopy(settings)
+    merged_hooks = merged.setdefault('hooks', {})
+
+    if stale:
+        for event in list(merged_hooks):
+            kept = []
+            for group in merged_hooks[event]:
+                if isinstance(group, dict) and group.get('hooks'):
+                    matcher = group.get('matcher', '')
+                    group['hooks'] = [h for h in group['hooks'] if hook_fingerprint(event, matcher, h) not in stale]
+                    if not group['hooks']:
+                        continue
+                kept.append(group)
+            if kept:
+                merged_hooks[event] = kept
+            else:
+                del merged_hooks[event]
+
+    incoming: Dict[str, List[Dict]] = {}
+    for addition in additions:
+        for event, groups in addition.get('hooks', {}).items():
+            incoming.setdefault(event, []).extend(groups)
+
+    for event in list(merged_hooks) + [e for e in incoming if e not in merged_hooks]:
+        seen = set()
+        by_matcher: Dict[str, Dict] = {}
+        groups = []
+
+        for group in merged_hooks.get(event, []) + copy.deepcopy(incoming.get(event, [])):
+            if not isinstance(group, dict) or not group.get('hooks'):
+                groups.append(group)
+                continue
+
+            matcher = group.get('matcher', '')
+            handlers = []
+            for handler in group['hooks']:
+                fingerprint = hook_fingerprint(event, matcher, handler)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    handlers.append(handler)
+            if not handlers:
+                continue
+
+            if matcher in by_matcher:
+                by_matcher[matcher]['hooks'].extend(handlers)
+            else:
+                group['hooks'] = handlers
+                by_matcher[matcher] = group
+                groups.append(group)
+
+        merged_hooks[event] = groups
+
+    return merged
+
+
+# Repo trees watched by --watch, and the registry of targets to sync
+WATCH_DIRS = ['skills', 'agents', 'commands', 'hooks']
+TARGETS_FILE = 'targets.json'
+
+
+class PollingWatcher:
+    """Report changed files under some roots by rescanning their stats."""
+
+    name = 'polling'
+
+    def __init__(self, roots: List[Path], interval: float = 0.5):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, List[int]]:
+        snapshot = {}
+        for root in self.roots:
+            if root.is_dir():
+                for rel, st in scan_files(root).items():
+                    snapshot[root / rel] = stat_key(st)
+        return snapshot
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change (or timeout expires); return their paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+            current = self._scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Report changed files under some roots using Linux inotify via ctypes."""
+
+    name = 'inotify'
+
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, roots: List[Path]):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.roots = roots
+        self.watches: Dict[int, Path] = {}
+        try:
+            for root in roots:
+                if root.is_dir():
+                    self._add_tree(root)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _add_tree(self, directory: Path) -> Set[Path]:
+        """Watch a directory and its subdirectories; return the files inside."""
+        files = set()
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {current}")
+            self.watches[wd] = current
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(Path(entry.path))
+                        else:
+                            files.add(Path(entry.path))
+            except FileNotFoundError:
+                pass
+        return files
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change (or timeout expires); return their paths."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        data = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+            offset += self.EVENT.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped: report everything and let the sync sort it out
+                return {root / rel for root in self.roots if root.is_dir() for rel in scan_files(root)}
+            if mask & self.IN_IGNORED:
+                # The watched directory was removed
+                self.watches.pop(wd, None)
+                continue
+            if wd not in self.watches or not name:
+                continue
+            path = self.watches[wd] / os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and path.is_dir():
+                    changed |= self._add_tree(path)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(roots: List[Path], poll: bool = False):
+    """Return an inotify watcher where available, else a polling one."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            # No inotify in libc, or out of watches (fs.inotify.max_user_watches)
+            pass
+    return PollingWatcher(roots)
+
+
+# Catalog sections in display order. MCP presets are split per platform
+# because the two platforms may reuse ids.
+CATALOG_SECTIONS = ['skills', 'agents', 'hooks', 'commands', 'mcp/claude-code', 'mcp/claude-desktop']
+
+# Map install kinds to catalog sections (MCP kinds depend on the target)
+SECTION_TITLES = {
+    'skills': 'Skills',
+    'agents': 'Agents',
+    'hooks': 'Hooks',
+    'commands': 'Commands',
+    'mcp/claude-code': 'MCP Presets (Claude Code)',
+    'mcp/claude-desktop': 'MCP Presets (Claude Desktop)',
+}
+
+KIND_SECTIONS = {
+    'skill': 'skills',
+    'agent': 'agents',
+    'hook': 'hooks',
+    'command': 'commands',
+}
+
+
+class CatalogIndex:
+    """Lookup tables compiled from catalog.json.
+
+    Components are indexed by section and id, by tag (inverted index) and by
+    the words of their id, name and description (a sorted vocabulary, so a
+    prefix lookup is a binary search). Built indexes are snapshotted with
+    pickle under ``.cache/`` and reused until catalog.json changes.
+    """
+
+    # Bump when the snapshot layout changes
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, catalog: Dict):
+        self.catalog = catalog
+        components = catalog.get('components', {})
+
+        self.sections: Dict[str, List[Dict]] = {}
+        for section in CATALOG_SECTIONS:
+            if section.startswith('mcp/'):
+                self.sections[section] = components.get('mcp', {}).get(section[4:], [])
+            else:
+                self.sections[section] = components.get(section, [])
+
+        self.by_id: Dict[str, Dict[str, Dict]] = {
+            section: {entry['id']: entry for entry in entries}
+            for section, entries in self.sections.items()
+        }
+        self.presets: Dict[str, Dict] = {preset['id']: preset for preset in catalog.get('presets', [])}
+
+        self.tags: Dict[str, List[Tuple[str, str]]] = {}
+        words: Dict[str, Set[Tuple[str, str]]] = {}
+        for section, entries in self.sections.items():
+            for entry in entries:
+                key = (section, entry['id'])
+                for tag in entry.get('tags', []):
+                    self.tags.setdefault(tag.lower(), []).append(key)
+                text = ' '.join([entry['id'], entry.get('name', ''), entry.get('description', '')])
+                for word in self.tokenize(text):
+                    words.setdefault(word, set()).add(key)
+        self.words = {word: sorted(keys) for word, keys in words.items()}
+        self.vocabulary = sorted(self.words)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return re.findall(r'[a-z0-9]+', text.lower())
+
+    @classmethod
+    def load(cls, catalog_path: Path, cache_dir: Path) -> 'CatalogIndex':
+        """Load the index for catalog_path, using the snapshot when current.
+
+        The snapshot is trusted when catalog.json's size and mtime match, or
+        failing that when its SHA-256 matches; otherwise it is rebuilt.
+        """
+        snapshot_path = cache_dir / 'catalog-index.pickle'
+        if not catalog_path.exists():
+            return cls({"components": {}, "presets": []})
+
+        st = catalog_path.stat()
+        signature = [st.st_size, st.st_mtime_ns]
+        snapshot = None
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot.get('version') != cls.SNAPSHOT_VERSION:
+                snapshot = None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            snapshot = None
+
+        if snapshot and snapshot['signature'] == signature:
+            return cls.from_state(snapshot['state'])
+
+        raw = catalog_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot and snapshot['sha256'] == digest:
+            index = cls.from_state(snapshot['state'])
+        else:
+            index = cls(json.loads(raw))
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = snapshot_path.with_name(f".{snapshot_path.name}.tmp-{os.getpid()}")
+            with open(tmp, 'wb') as f:
+                pickle.dump({
+                    'version': cls.SNAPSHOT_VERSION,
+                    'signature': signature,
+                    'sha256': digest,
+                    'state': index.__dict__,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, snapshot_path)
+        except OSError:
+            # A read-only checkout just goes without the snapshot
+            pass
+        return index
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'CatalogIndex':
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
+
+    def get(self, section: str, component_id: str) -> Optional[Dict]:
+        return self.by_id.get(section, {}).get(component_id)
+
+    def search(self, query: str) -> List[Tuple[str, Dict]]:
+        """Find components by tag or text.
+
+        Matches everything tagged with the query, plus components where every
+        word of the query prefix-matches a word of their id, name or
+        description. Results keep catalog order.
+        """
+        query = query.strip().lower()
+        keys = None
+        for term in self.tokenize(query):
+            matched = set()
+            start = bisect.bisect_left(self.vocabulary, term)
+            for word in self.vocabulary[start:]:
+                if not word.startswith(term):
+                    break
+                matched.update(self.words[word])
+            keys = matched if keys is None else keys & matched
+            if not keys:
+                break
+        keys = (keys or set()) | set(self.tags.get(query, []))
+
+        return [
+            (section, entry)
+            for section, entries in self.sections.items()
+            for entry in entries
+            if (section, entry['id']) in keys
+        ]
+
+
+class BackupStore:
+    """Content-addressed backup storage under <target>/.backups.
+
+    File contents are stored once as hash-named blobs in ``objects/`` and each
+    backup is a small ``backup-<timestamp>.json`` manifest mapping backed-up
+    paths to blob hashes. Blobs are copied in on first sight (never hardlinked
+    to the live file, which could be edited in place) and referenced by every
+    later manifest, so backing up an unchanged tree only writes a manifest.
+    A stat cache (``index.json``) avoids re-hashing files whose size, mtime
+    and inode have not changed since the previous backup.
+
+    Backups can instead be written as a single ``backup-<timestamp>.tar.gz``
+    archive (see create_archive), and legacy ``backup-<timestamp>/``
+    directory backups are still listed, restored and rotated.
+    """
+
+    FORMAT_VERSION = 1
+
+    # First member of an archive backup, listing its dirs and files
+    ARCHIVE_INDEX = '.backup-index.json'
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.objects = root / 'objects'
+        self.index_path = root / 'index.json'
+        self._index: Optional[Dict[str, list]] = None
+
+    @staticmethod
+    def backup_id(backup: Path) -> str:
+        """Return the backup id (``backup-<timestamp>``) for a backup path."""
+        for suffix in ('.json', '.tar.gz'):
+            if backup.name.endswith(suffix):
+                return backup.name[:-len(suffix)]
+        return backup.name
+
+    @staticmethod
+    def is_archive(backup: Path) -> bool:
+        return backup.name.endswith('.tar.gz')
+
+    def _reserve_backup(self, suffix: str) -> Path:
+        """Create an empty placeholder under a new backup id and return its path.
+
+        Ids carry microseconds and a counter on collision, and the placeholder
+        is created with O_EXCL, so no two backups ever share an id; the caller
+        replaces it with the finished backup (or removes it on failure).
+        """
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        attempt = 0
+        while True:
+            backup_id = f"backup-{stamp}" + (f"-{attempt:03d}" if attempt else '')
+            attempt += 1
+            if any((self.root / f"{backup_id}{other}").exists() for other in ('', '.json', '.tar.gz')):
+                continue
+            path = self.root / f"{backup_id}{suffix}"
+            try:
+                os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                continue
+            return path
+
+    def list(self) -> List[Path]:
+        """List backups, newest first."""
+        if not self.root.exists():
+            return []
+        return sorted(self.root.glob('backup-*'), key=self.backup_id, reverse=True)
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest[2:]
+
+    def _load_index(self) -> Dict[str, list]:
+        if self._index is None:
+            self._index = {}
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path) as f:
+                        self._index = json.load(f)
+                except (OSError, ValueError):
+                    self._index = {}
+        return self._index
+
+    def _store_file(self, path: Path, st: os.stat_result) -> str:
+        """Hash a file and make sure its blob exists; return the digest."""
+        index = self._load_index()
+        key = str(path)
+        cached = index.get(key)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+        if cached and cached[:3] == signature and self.blob_path(cached[3]).exists():
+            return cached[3]
+
+        digest = file_sha256(path)
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(f".{blob.name}.tmp-{os.getpid()}")
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, blob)
+        index[key] = signature + [digest]
+        return digest
+
+    def _add_tree(self, name: str, source: Path, manifest: Dict):
+        """Record a directory tree, dereferencing symlinks like copytree(symlinks=False)."""
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=True):
+            dirnames.sort()
+            rel_dir = Path(name) / Path(dirpath).relative_to(source)
+            manifest['dirs'].append(rel_dir.as_posix())
+            for filename in sorted(filenames):
+                path = Path(dirpath) / filename
+                try:
+                    st = path.stat()
+                except OSError:
+                    # Dangling symlink; nothing to back up
+                    continue
+                manifest['files'][(rel_dir / filename).as_posix()] = {
+                    'hash': self._store_file(path, st),
+                    'mode': st.st_mode & 0o777,
+                }
+
+    def create(self, subdirs: Dict[str, Path], config_files: Dict[str, Path]) -> Tuple[Path, Dict]:
+        """Create a backup manifest for the given directories and files."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'version': self.FORMAT_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'dirs': [],
+            'files': {},
+        }
+
+        for name, source in subdirs.items():
+            self._add_tree(name, source, manifest)
+
+        for name, source in config_files.items():
+            st = source.stat()
+            manifest['files'][name] = {
+                'hash': self._store_file(source, st),
+                'mode': st.st_mode & 0o777,
+            }
+
+        backup_path = self._reserve_backup('.json')
+        try:
+            write_json_file(backup_path, manifest, sort_keys=True)
+        except BaseException:
+            backup_path.unlink()
+            raise
+        write_json_file(self.index_path, self._load_index(), sort_keys=True)
+        return backup_path, manifest
+
+    def load_manifest(self, backup: Path) -> Dict:
+        with open(backup) as f:
+            return json.load(f)
+
+    def extract_file(self, entry: Dict, dest: Path):
+        """Materialize one manifest entry at dest as an independent copy."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.is_symlink():
+            dest.unlink()
+        shutil.copyfile(self.blob_path(entry['hash']), dest)
+        os.chmod(dest, entry['mode'])
+
+    def extract_tree(self, manifest: Dict, name: str, dest: Path):
+        """Rebuild the backed-up directory ``name`` at dest."""
+        prefix = name + '/'
+        for rel_dir in manifest['dirs']:
+            if rel_dir == name or rel_dir.startswith(prefix):
+                (dest / rel_dir[len(name):].lstrip('/')).mkdir(parents=True, exist_ok=True)
+        for rel_path, entry in manifest['files'].items():
+            if rel_path.startswith(prefix):
+                self.extract_file(entry, dest / rel_path[len(prefix):])
+
+    @staticmethod
+    def _walk_tree(name: str, source: Path) -> Iterator[Tuple[str, Optional[Path]]]:
+        """Yield (relative path, file) for a tree, with file None for directories."""
+        for dirpath, dirnames, filenames in os.walk(source, followlinks=True):
+            dirnames.sort()
+            rel_dir = Path(name) / Path(dirpath).relative_to(source)
+            yield rel_dir.as_posix(), None
+            for filename in sorted(filenames):
+                yield (rel_dir / filename).as_posix(), Path(dirpath) / filename
+
+    def create_archive(self, subdirs: Dict[str, Path], config_files: Dict[str, Path]) -> Tuple[Path, Dict]:
+        """Stream the given directories and files into one compressed tarball.
+
+        Files are read straight into the gzip stream, so nothing is staged on
+        disk. The first member is an index of every directory and file (with
+        size and mode), so listing or picking components never needs a scan.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        entries: List[Tuple[str, Optional[Path], Optional[os.stat_result]]] = []
+        index = {
+            'version': self.FORMAT_VERSION,
+            'format': 'archive',
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'dirs': [],
+            'files': {},
+        }
+
+        for name, source in list(subdirs.items()) + [(n, None) for n in config_files]:
+            items = self._walk_tree(name, source) if source is not None else [(name, config_files[name])]
+            for rel_path, path in items:
+                if path is None:
+                    index['dirs'].append(rel_path)
+                    entries.append((rel_path, None, None))
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    # Dangling symlink; nothing to back up
+                    continue
+                index['files'][rel_path] = {'size': st.st_size, 'mode': st.st_mode & 0o777}
+                entries.append((rel_path, path, st))
+
+        backup_path = self._reserve_backup('.tar.gz')
+        tmp = backup_path.with_name(f".{backup_path.name}.tmp-{os.getpid()}")
+        try:
+            with tarfile.open(str(tmp), 'w|gz') as tar:
+                data = json.dumps(index, sort_keys=True).encode()
+                info = tarfile.TarInfo(self.ARCHIVE_INDEX)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+
+                for rel_path, path, st in entries:
+                    info = tarfile.TarInfo(rel_path)
+                    if path is None:
+                        info.type = tarfile.DIRTYPE
+                        info.mode = 0o755
+                        info.mtime = int(time.time())
+                        tar.addfile(info)
+                        continue
+                    info.mode = st.st_mode & 0o777
+                    info.mtime = int(st.st_mtime)
+                    with open(path, 'rb') as f:
+                        # Size from the open file, in case it changed since the walk
+                        info.size = os.fstat(f.fileno()).st_size
+                        tar.addfile(info, f)
+            os.replace(tmp, backup_path)
+        except BaseException:
+            if tmp.exists():
+                tmp.unlink()
+            if backup_path.exists():
+                backup_path.unlink()
+            raise
+        return backup_path, index
+
+    def load_archive_index(self, archive: Path) -> Dict:
+        """Read the index member at the start of an archive backup."""
+        with tarfile.open(str(archive), 'r|gz') as tar:
+            member = tar.next()
+            if member is None or member.name != self.ARCHIVE_INDEX:
+                raise ValueError(f"{archive.name} has no backup index")
+            return json.load(tar.extractfile(member))
+
+    def extract_archive(self, archive: Path, roots: Dict[str, Path]):
+        """Stream an archive and extract the members under the given roots.
+
+        roots maps backed-up paths (a directory such as ``skills`` or
+        ``skills/git-workflow``, or a config file name) to their destination.
+        Only one sequential pass over the compressed stream is made.
+        """
+        with tarfile.open(str(archive), 'r|gz') as tar:
+            for member in tar:
+                if member.name == self.ARCHIVE_INDEX:
+                    continue
+                parts = member.name.split('/')
+                if '..' in parts or member.name.startswith('/'):
+                    raise ValueError(f"unsafe path in backup: {member.name}")
+
+                for root, dest_root in roots.items():
+                    if member.name == root:
+                        dest = dest_root
+                    elif member.name.startswith(root + '/'):
+                        dest = dest_root / member.name[len(root) + 1:]
+                    else:
+                        continue
+
+                    if member.isdir():
+                        dest.mkdir(parents=True, exist_ok=True)
+                    elif member.isfile():
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        if dest.is_symlink():
+                            dest.unlink()
+                        with tar.extractfile(member) as src, open(dest, 'wb') as out:
+                            shutil.copyfileobj(src, out)
+                        os.chmod(dest, member.mode & 0o777)
+                    break
+
+    def prune(self, keep: int = BACKUP_KEEP):
+        """Drop all but the newest ``keep`` backups and unreferenced blobs."""
+        backups = self.list()
+        for old_backup in backups[keep:]:
+            if old_backup.is_dir():
+                shutil.rmtree(old_backup)
+            else:
+                old_backup.unlink()
+
+        referenced = set()
+        for backup in backups[:keep]:
+            if backup.is_file() and not self.is_archive(backup):
+                try:
+                    manifest = self.load_manifest(backup)
+                except (OSError, ValueError):
+                    continue
+                referenced.update(entry['hash'] for entry in manifest['files'].values())
+
+        if not self.objects.exists():
+            return
+        for bucket in self.objects.iterdir():
+            for blob in bucket.iterdir():
+                if bucket.name + blob.name not in referenced:
+                    blob.unlink()
+            if not any(bucket.iterdir()):
+                bucket.rmdir()
+
+        index = self._load_index()
+        stale = [key for key, value in index.items() if value[3] not in referenced]
+        if stale:
+            for key in stale:
+                del index[key]
+            write_json_file(self.index_path, index, sort_keys=True)
 
 
 class Installer:
-    def __init__(self):
+    """Install, back up, restore and verify extensions for one checkout.
+
+    This is the library layer: it never prints, prompts or exits. Every
+    operation returns result objects (InstallReport, RestoreResult,
+    VerifyResult, ...) or raises; InstallerTUI is the command-line front end.
+    """
+
+    def __init__(self, repo_dir: Optional[Path] = None, index: Optional[CatalogIndex] = None,
+                 timings: Optional[Timings] = None):
         self.script_dir = Path(__file__).parent
-        self.repo_dir = self.script_dir.parent
-        self.catalog = self._load_catalog()
+        self.repo_dir = repo_dir or self.script_dir.parent
+        self.timings = timings or Timings()
+        with self.timings.span('catalog load'):
+            self.index = index or self._load_catalog()
+        self.catalog = self.index.catalog
 
         # Target directories
         self.claude_code_global = Path.home() / ".claude"
@@ -64,13 +1272,27 @@ class Installer:
         self.backup_dir: Optional[Path] = None
         self.no_backup = False
 
-    def _load_catalog(self) -> Dict:
-        """Load the catalog.json file."""
-        catalog_path = self.repo_dir / "catalog.json"
-        if catalog_path.exists():
-            with open(catalog_path) as f:
-                return json.load(f)
-        return {"components": {}, "presets": []}
+        # 'store' (content-addressed manifests) or 'archive' (one tarball)
+        self.backup_format = 'store'
+
+        # Worker threads used by do_install
+        self.jobs = DEFAULT_JOBS
+
+        # Reinstall components even when the install state says they are current
+        self.force = False
+
+    def spawn(self) -> 'Installer':
+        """Return a fresh library installer sharing this one's repo, catalog and options."""
+        child = Installer(self.repo_dir, self.index, self.timings)
+        child.no_backup = self.no_backup
+        child.backup_format = self.backup_format
+        child.force = self.force
+        child.jobs = self.jobs
+        return child
+
+    def _load_catalog(self) -> CatalogIndex:
+        """Load the compiled index of the catalog.json file."""
+        return CatalogIndex.load(self.repo_dir / "catalog.json", self.repo_dir / ".cache")
 
     def get_claude_desktop_path(self) -> Optional[Path]:
         """Get the Claude Desktop config path for current platform."""
@@ -80,135 +1302,1378 @@ class Installer:
             return self.claude_desktop_linux
         return None
 
-    def create_backup(self, target_dir: Path) -> Optional[Path]:
-        """Create a backup of existing configuration."""
+    def backup_config_files(self, target_dir: Path) -> Dict[str, Path]:
+        """Map config file names inside a backup to their live locations."""
+        return {
+            'settings.json': target_dir / 'settings.json',
+            '.mcp.json': target_dir.parent / '.mcp.json',
+            'claude_desktop_config.json': target_dir / 'claude_desktop_config.json',
+        }
+
+    def create_backup(self, target_dir: Path, keep: int = BACKUP_KEEP) -> Optional[Path]:
+        """Create a backup of existing configuration, keeping the newest ``keep``."""
         if self.no_backup:
             return None
 
+        subdir_paths = {
+            subdir: target_dir / subdir
+            for subdir in BACKUP_SUBDIRS
+            if (target_dir / subdir).exists() and any((target_dir / subdir).iterdir())
+        }
+        config_paths = {
+            name: config_file
+            for name, config_file in self.backup_config_files(target_dir).items()
+            if config_file.exists()
+        }
+
         # Check if there's anything to backup
-        has_content = False
-        subdirs = ['skills', 'agents', 'commands', 'hooks']
+        if not subdir_paths and not config_paths:
+            return None
 
-        for subdir in subdirs:
-            subdir_path = target_dir / subdir
-            if subdir_path.exists() and any(subdir_path.iterdir()):
-                has_content = True
-                break
+        store = BackupStore(target_dir / '.backups')
+        with locked_file(store.index_path, target_dir / LOCKS_DIR):
+            with self.timings.span('backup'):
+                if self.backup_format == 'archive':
+                    backup_path, _ = store.create_archive(subdir_paths, config_paths)
+                else:
+                    backup_path, _ = store.create(subdir_paths, config_paths)
+            # Keep only the most recent backups
+            with self.timings.span('backup rotation'):
+                store.prune(keep)
+
+        self.backup_dir = backup_path
+        return backup_path
+
+    def list_backups(self, target_dir: Path) -> List[BackupInfo]:
+        """List available backups, newest first."""
+        return [BackupInfo.from_path(backup) for backup in BackupStore(target_dir / '.backups').list()]
+
+    def find_backup(self, target_dir: Path, backup_id: str) -> Optional[BackupInfo]:
+        """Find a backup by id (``backup-<timestamp>``, or ``latest``)."""
+        backups = self.list_backups(target_dir)
+        if backup_id == 'latest':
+            return backups[0] if backups else None
+        for backup in backups:
+            if backup.backup_id in (backup_id, f"backup-{backup_id}"):
+                return backup
+        return None
 
-        config_files = [
-            target_dir / 'settings.json',
-            target_dir.parent / '.mcp.json',
-            target_dir / 'claude_desktop_config.json'
-        ]
+    def restore_backup(self, target_dir: Path, backup_id: str = 'latest',
+                       only: Optional[List[str]] = None) -> RestoreResult:
+        """Restore a backup by id (or ``latest``) into target_dir.
 
-        for config_file in config_files:
-            if config_file.exists():
-                has_content = True
-                break
+        only limits the restore to some backed-up paths, such as
+        ``skills/git-workflow`` or ``settings.json``.
+        """
+        backup = self.find_backup(target_dir, backup_id)
+        if backup is None:
+            error = 'no backups found' if backup_id == 'latest' else f"backup not found: {backup_id}"
+            return RestoreResult(backup_id, None, [], error)
 
-        if not has_content:
-            return None
+        try:
+            with self.timings.span('restore'):
+                restored = self._apply_backup(backup.path, target_dir, only)
+        except (OSError, ValueError, tarfile.TarError) as e:
+            return RestoreResult(backup.backup_id, backup.path, [], str(e))
+        return RestoreResult(backup.backup_id, backup.path, restored)
+
+    def _apply_backup(self, backup: Path, target_dir: Path, only: Optional[List[str]]) -> List[str]:
+        if backup.is_dir():
+            return self._restore_legacy_backup(backup, target_dir, only)
+        elif BackupStore.is_archive(backup):
+            return self._restore_archive_backup(backup, target_dir, only)
+        else:
+            return self._restore_manifest_backup(backup, target_dir, only)
+
+    def backup_dest(self, target_dir: Path, rel_path: str) -> Path:
+        """Return the live location of a path inside a backup."""
+        config_files = self.backup_config_files(target_dir)
+        if rel_path in config_files:
+            return config_files[rel_path]
+        return target_dir / rel_path
+
+    def _restore_roots(self, contents: Dict, only: Optional[List[str]]) -> List[str]:
+        """Pick the backed-up paths to restore from a manifest or archive index."""
+        if only:
+            missing = [r for r in only if r not in contents['dirs'] and r not in contents['files']]
+            if missing:
+                raise ValueError(f"not in backup: {', '.join(missing)}")
+            return list(only)
+        return ([d for d in BACKUP_SUBDIRS if d in contents['dirs']] +
+                [n for n in self.backup_config_files(Path()) if n in contents['files']])
+
+    @staticmethod
+    def _remove_path(path: Path):
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+        elif path.exists():
+            shutil.rmtree(path)
+
+    @staticmethod
+    def _staging_path(dest: Path) -> Path:
+        """Return a scratch path next to dest, on the same filesystem."""
+        return dest.with_name(f".{dest.name}.restore-{os.getpid()}")
+
+    def _swap_in(self, staged: Path, dest: Path):
+        """Move a fully built staged file or tree into place.
+
+        Files are switched with one atomic os.replace. A directory (or a
+        symlink to one) cannot be replaced atomically, so the live one is
+        renamed aside and the staged one renamed in: two renames with no
+        copying in between. The old tree is deleted on a background thread.
+        """
+        if staged.is_dir() and (dest.is_symlink() or dest.is_dir()):
+            old = dest.with_name(f".{dest.name}.old-{os.getpid()}")
+            self._remove_path(old)
+            os.rename(dest, old)
+            os.rename(staged, dest)
+            threading.Thread(target=self._remove_path, args=(old,), name=f"cleanup-{dest.name}").start()
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, dest)
+
+    def _restore_staged(self, roots: Dict[str, Path], build: Callable[[Dict[str, Path]], None]) -> List[str]:
+        """Build every root next to its destination, then swap them all in.
+
+        Nothing live is touched until the whole backup has been extracted, so
+        a failure part-way leaves the current configuration intact. Returns
+        the restored roots, directories with a trailing slash.
+        """
+        staged = {root: self._staging_path(dest) for root, dest in roots.items()}
+        for path in staged.values():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._remove_path(path)
+        try:
+            build(staged)
+        except BaseException:
+            for path in staged.values():
+                self._remove_path(path)
+            raise
+
+        restored = []
+        for root, dest in roots.items():
+            self._swap_in(staged[root], dest)
+            restored.append(f"{root}{'/' if dest.is_dir() and not dest.is_symlink() else ''}")
+        return restored
+
+    def _restore_legacy_backup(self, backup: Path, target_dir: Path, only: Optional[List[str]] = None) -> List[str]:
+        """Restore a pre-manifest ``backup-<timestamp>/`` directory backup."""
+        names = only or [n for n in BACKUP_SUBDIRS + list(self.backup_config_files(target_dir)) if (backup / n).exists()]
+        for root in names:
+            if not (backup / root).exists():
+                raise ValueError(f"not in backup: {root}")
+        roots = {root: self.backup_dest(target_dir, root) for root in names}
+
+        def build(staged: Dict[str, Path]):
+            for root, path in staged.items():
+                if (backup / root).is_dir():
+                    shutil.copytree(backup / root, path)
+                else:
+                    shutil.copy2(backup / root, path)
+
+        return self._restore_staged(roots, build)
+
+    def _restore_manifest_backup(self, backup: Path, target_dir: Path, only: Optional[List[str]] = None) -> List[str]:
+        """Rebuild directories and config files from a backup manifest."""
+        store = BackupStore(backup.parent)
+        manifest = store.load_manifest(backup)
+        roots = {root: self.backup_dest(target_dir, root) for root in self._restore_roots(manifest, only)}
+
+        def build(staged: Dict[str, Path]):
+            for root, path in staged.items():
+                if root in manifest['files']:
+                    store.extract_file(manifest['files'][root], path)
+                else:
+                    store.extract_tree(manifest, root, path)
+
+        return self._restore_staged(roots, build)
+
+    def _restore_archive_backup(self, backup: Path, target_dir: Path, only: Optional[List[str]] = None) -> List[str]:
+        """Restore directories and config files by streaming an archive backup."""
+        store = BackupStore(backup.parent)
+        index = store.load_archive_index(backup)
+        roots = {root: self.backup_dest(target_dir, root) for root in self._restore_roots(index, only)}
+        return self._restore_staged(roots, lambda staged: store.extract_archive(backup, staged))
+
+    def install_skill(self, skill_id: str, target_dir: Path, mode: str) -> ComponentResult:
+        """Install a skill."""
+        source = self.repo_dir / "skills" / skill_id
+        dest = target_dir / "skills" / skill_id
 
-        # Create backup directory
-        backup_name = f"backup-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-        backup_dir = target_dir / '.backups' / backup_name
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        if not source.exists():
+            return ComponentResult('skill', skill_id, 'missing')
 
-        print(color(f"\nCreating backup at: {backup_dir}", Colors.BLUE))
+        dest.parent.mkdir(parents=True, exist_ok=True)
 
-        # Backup directories
-        for subdir in subdirs:
-            subdir_path = target_dir / subdir
-            if subdir_path.exists() and any(subdir_path.iterdir()):
-                # Use copytree with follow_symlinks=True to dereference symlinks
-                shutil.copytree(subdir_path, backup_dir / subdir, symlinks=False, dirs_exist_ok=True)
-                print(color(f"  Backed up {subdir}/", Colors.DIM))
+        if dest.exists():
+            if dest.is_symlink():
+                dest.unlink()
+            else:
+                shutil.rmtree(dest)
 
-        # Backup config files
-        if (target_dir / 'settings.json').exists():
-            shutil.copy2(target_dir / 'settings.json', backup_dir / 'settings.json')
-            print(color("  Backed up settings.json", Colors.DIM))
+        if mode == 'symlink':
+            dest.symlink_to(source)
+        else:
+            shutil.copytree(source, dest, copy_function=COPY_FUNCTIONS[mode])
 
-        if (target_dir.parent / '.mcp.json').exists():
-            shutil.copy2(target_dir.parent / '.mcp.json', backup_dir / '.mcp.json')
-            print(color("  Backed up .mcp.json", Colors.DIM))
+        return ComponentResult('skill', skill_id, 'installed')
 
-        if (target_dir / 'claude_desktop_config.json').exists():
-            shutil.copy2(target_dir / 'claude_desktop_config.json', backup_dir / 'claude_desktop_config.json')
-            print(color("  Backed up claude_desktop_config.json", Colors.DIM))
+    def install_agent(self, agent_id: str, target_dir: Path, mode: str) -> ComponentResult:
+        """Install an agent."""
+        source = self.repo_dir / "agents" / f"{agent_id}.md"
+        dest = target_dir / "agents" / f"{agent_id}.md"
 
-        print(color("Backup created successfully", Colors.GREEN))
-        print()
+        if not source.exists():
+            return ComponentResult('agent', agent_id, 'missing')
 
-        # Keep only last 5 backups
-        backups_dir = target_dir / '.backups'
-        if backups_dir.exists():
-            backups = sorted(backups_dir.glob('backup-*'), key=lambda p: p.name, reverse=True)
-            for old_backup in backups[5:]:
-                shutil.rmtree(old_backup)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if dest.exists():
+            dest.unlink()
+
+        if mode == 'symlink':
+            dest.symlink_to(source)
+        else:
+            COPY_FUNCTIONS[mode](source, dest)
+
+        return ComponentResult('agent', agent_id, 'installed')
+
+    def install_hook(self, hook_id: str, target_dir: Path) -> ComponentResult:
+        """Install a hook by merging settings.json."""
+        return self.install_hooks([hook_id], target_dir)[0]
+
+    def install_hooks(self, hook_ids: List[str], target_dir: Path) -> List[ComponentResult]:
+        """Install hooks with a single read-modify-write of settings.json.
+
+        Handlers are deduplicated (see merge_hook_settings), and handlers a
+        hook defined when it was last installed (recorded in the install
+        state) but no longer does are removed, unless another installed hook
+        still defines them. The file is only rewritten when the merged result
+        differs from what is on disk.
+        """
+        target_settings = target_dir / "settings.json"
+        results = []
+        additions = []
+
+        recorded = self.load_install_state(target_dir)['components']
+        stale = set()
+        for hook_id in hook_ids:
+            stale.update(recorded.get(f"hook:{hook_id}", {}).get('handlers', []))
+        for entry in recorded.values():
+            if entry.get('kind') == 'hook' and entry.get('id') not in hook_ids:
+                stale.difference_update(entry.get('handlers', []))
+
+        for hook_id in hook_ids:
+            source_settings = self.repo_dir / "hooks" / hook_id / "settings.json"
+            if not source_settings.exists():
+                results.append(ComponentResult('hook', hook_id, 'missing'))
+                continue
+
+            # Load hook settings
+            with open(source_settings) as f:
+                additions.append(json.load(f))
+            results.append(ComponentResult('hook', hook_id, 'installed'))
+
+        if not additions:
+            return results
+
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        with locked_file(target_settings, target_dir / LOCKS_DIR):
+            # Load existing settings
+            existing = {}
+            if target_settings.exists():
+                with open(target_settings) as f:
+                    existing = json.load(f)
+
+            # Merge hooks and write only if something changed
+            merged = merge_hook_settings(existing, additions, stale)
+            if merged != existing or not target_settings.exists():
+                write_json_file(target_settings, merged)
+
+        return results
+
+    def install_command(self, command_id: str, target_dir: Path, mode: str) -> ComponentResult:
+        """Install a command."""
+        source = self.repo_dir / "commands" / f"{command_id}.md"
+        dest = target_dir / "commands" / f"{command_id}.md"
+
+        if not source.exists():
+            return ComponentResult('command', command_id, 'missing')
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        if dest.exists():
+            dest.unlink()
+
+        if mode == 'symlink':
+            dest.symlink_to(source)
+        else:
+            COPY_FUNCTIONS[mode](source, dest)
+
+        return ComponentResult('command', command_id, 'installed')
+
+    def install_mcp(self, preset_id: str, target_dir: Path, target_type: str) -> ComponentResult:
+        """Install an MCP preset."""
+        if target_type == 'claude-code':
+            source = self.repo_dir / "mcp" / "claude-code" / f"{preset_id}.json"
+            target = target_dir.parent / ".mcp.json"
+        else:
+            source = self.repo_dir / "mcp" / "claude-desktop" / f"{preset_id}.json"
+            target = target_dir / "claude_desktop_config.json"
+
+        if not source.exists():
+            return ComponentResult('mcp', preset_id, 'missing')
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Load preset
+        with open(source) as f:
+            preset = json.load(f)
+
+        with locked_file(target, target_dir / LOCKS_DIR):
+            # Load existing config
+            existing = {}
+            if target.exists():
+                with open(target) as f:
+                    existing = json.load(f)
+
+            # Merge mcpServers
+            existing.setdefault('mcpServers', {})
+            existing['mcpServers'].update(preset.get('mcpServers', {}))
+
+            # Write merged config
+            write_json_file(target, existing)
+
+        return ComponentResult('mcp', preset_id, 'installed')
+
+    def component_source(self, kind: str, component_id: str, target_type: str = 'claude-code') -> Path:
+        """Return the repo path a component is installed from."""
+        if kind == 'skill':
+            return self.repo_dir / "skills" / component_id
+        if kind == 'agent':
+            return self.repo_dir / "agents" / f"{component_id}.md"
+        if kind == 'command':
+            return self.repo_dir / "commands" / f"{component_id}.md"
+        if kind == 'hook':
+            return self.repo_dir / "hooks" / component_id / "settings.json"
+        platform = 'claude-desktop' if target_type == 'claude-desktop' else 'claude-code'
+        return self.repo_dir / "mcp" / platform / f"{component_id}.json"
+
+    def component_dest(self, kind: str, component_id: str, target_dir: Path) -> Optional[Path]:
+        """Return the path a skill, agent or command is installed to."""
+        if kind == 'skill':
+            return target_dir / "skills" / component_id
+        if kind == 'agent':
+            return target_dir / "agents" / f"{component_id}.md"
+        if kind == 'command':
+            return target_dir / "commands" / f"{component_id}.md"
+        # Hooks and MCP presets are merged into shared config files
+        return None
+
+    def component_version(self, kind: str, component_id: str, target_type: str = 'claude-code') -> Optional[str]:
+        """Return a component's version from catalog.json."""
+        if kind == 'mcp':
+            section = 'mcp/claude-desktop' if target_type == 'claude-desktop' else 'mcp/claude-code'
+        else:
+            section = KIND_SECTIONS[kind]
+        entry = self.index.get(section, component_id)
+        return entry.get('version') if entry else None
+
+    def selected_components(self, target_type: str) -> List[Tuple[str, str]]:
+        """Return the selected (kind, id) pairs that apply to a target type."""
+        if target_type == 'claude-desktop':
+            # Desktop only supports MCP
+            return [('mcp', mcp_id) for mcp_id in sorted(self.selected_mcp)]
+        selected = {
+            'skill': self.selected_skills,
+            'agent': self.selected_agents,
+            'command': self.selected_commands,
+            'hook': self.selected_hooks,
+            'mcp': self.selected_mcp,
+        }
+        return [(kind, component_id) for kind in COMPONENT_KINDS for component_id in sorted(selected[kind])]
+
+    def load_install_state(self, target_dir: Path) -> Dict:
+        """Load the install-state manifest of a target, if any."""
+        state_path = target_dir / INSTALL_STATE_FILE
+        if state_path.exists():
+            try:
+                with open(state_path) as f:
+                    state = json.load(f)
+                if state.get('version') == INSTALL_STATE_VERSION:
+                    return state
+            except (OSError, ValueError):
+                pass
+        return {'version': INSTALL_STATE_VERSION, 'components': {}}
+
+    def save_install_state(self, target_dir: Path, state: Dict):
+        """Write the install-state manifest if it changed on disk."""
+        if state == self.load_install_state(target_dir):
+            return
+        target_dir.mkdir(parents=True, exist_ok=True)
+        write_json_file(target_dir / INSTALL_STATE_FILE, state, sort_keys=True)
+
+    def _dest_is_current(self, kind: str, component_id: str, target_dir: Path, source: Path, mode: str) -> bool:
+        """Cheaply check that an installed component is still in place."""
+        dest = self.component_dest(kind, component_id, target_dir)
+        if dest is None:
+            return True
+        if mode == 'symlink':
+            return dest.is_symlink() and Path(os.readlink(dest)) == source
+        return dest.exists() and not dest.is_symlink()
+
+    def plan_install(self, target_dir: Path, target_type: str, mode: str) -> List[PlanEntry]:
+        """Compare the selection against the target's install state.
+
+        Each entry carries the state record the component will have once it is
+        installed, so do_install can persist it without re-hashing.
+        """
+        recorded = self.load_install_state(target_dir)['components']
+        plan = []
+
+        for kind, component_id in self.selected_components(target_type):
+            source = self.component_source(kind, component_id, target_type)
+            if not source.exists():
+                plan.append(PlanEntry(kind, component_id, 'missing', 'not found in repository'))
+                continue
+
+            entry_mode = mode if kind in ('skill', 'agent', 'command') else 'merge'
+            digest, file_hashes = hash_source(source)
+            state = {
+                'kind': kind,
+                'id': component_id,
+                'version': self.component_version(kind, component_id, target_type),
+                'mode': entry_mode,
+                'hash': digest,
+            }
+            if kind == 'hook':
+                # What this hook adds to settings.json, so a later re-merge can
+                # drop the handlers it no longer defines
+                state['handlers'] = hook_handlers(source)
+            elif entry_mode != 'merge':
+                # Per-file hashes and source stats for --verify; the installed
+                # file stats are added by do_install once the copy exists
+                source_stats = scan_files(source)
+                state['files'] = {
+                    rel: {'sha256': file_hash, 'source': stat_key(source_stats[rel])}
+                    for rel, file_hash in file_hashes.items() if rel in source_stats
+                }
+
+            previous = recorded.get(f"{kind}:{component_id}")
+            if previous is None:
+                action, reason = 'install', 'not installed'
+            elif self.force:
+                action, reason = 'update', 'forced'
+            elif previous.get('mode') != entry_mode:
+                action, reason = 'update', f"mode {previous.get('mode')} -> {entry_mode}"
+            elif previous.get('hash') != digest:
+                action, reason = 'update', 'source changed'
+            elif previous.get('version') != state['version']:
+                action, reason = 'update', f"version {previous.get('version')} -> {state['version']}"
+            elif not self._dest_is_current(kind, component_id, target_dir, source, entry_mode):
+                action, reason = 'update', 'destination missing or replaced'
+            else:
+                action, reason = 'unchanged', ''
+            plan.append(PlanEntry(kind, component_id, action, reason, state))
+
+        return plan
+
+    def _install_tasks(self, target_dir: Path, target_type: str, mode: str,
+                       pending: List[Tuple[str, str]]) -> List[List[Tuple[str, List[str], Callable[[], List[ComponentResult]]]]]:
+        """Group pending installs into independently runnable chains.
+
+        Each skill, agent and command writes only its own destination, so
+        each one is a chain of its own. All hooks are merged into settings.json
+        by one batched task, and MCP presets all merge into one config file, so
+        they stay a single ordered chain.
+        """
+        mcp_target = 'claude-desktop' if target_type == 'claude-desktop' else 'claude-code'
+        installers = {
+            'skill': lambda i: [self.install_skill(i, target_dir, mode)],
+            'agent': lambda i: [self.install_agent(i, target_dir, mode)],
+            'command': lambda i: [self.install_command(i, target_dir, mode)],
+            'mcp': lambda i: [self.install_mcp(i, target_dir, mcp_target)],
+        }
+
+        chains = []
+        hook_ids = []
+        mcp_chain = []
+        for kind, component_id in pending:
+            if kind == 'hook':
+                hook_ids.append(component_id)
+                continue
+            task = (kind, [component_id], lambda k=kind, i=component_id: installers[k](i))
+            if kind == 'mcp':
+                mcp_chain.append(task)
+            else:
+                chains.append([task])
+        if hook_ids:
+            chains.append([('hook', hook_ids, lambda: self.install_hooks(hook_ids, target_dir))])
+        if mcp_chain:
+            chains.append(mcp_chain)
+        return chains
+
+    def _run_chain(self, chain: List[Tuple[str, List[str], Callable[[], List[ComponentResult]]]]) -> List[ComponentResult]:
+        results = []
+        for kind, component_ids, task in chain:
+            name = 'hooks merge' if kind == 'hook' else f"{kind} {component_ids[0]}"
+            try:
+                with self.timings.span(name, 'component'):
+                    results.extend(task())
+            except (OSError, ValueError) as e:
+                results.extend(ComponentResult(kind, i, 'failed', str(e)) for i in component_ids)
+        return results
+
+    def do_install(self, target_dir: Path, target_type: str, mode: str) -> InstallReport:
+        """Install the selected components into a target.
+
+        Only components that are new, changed (source hash, mode or version)
+        or missing from the target are installed, unless ``self.force`` is set.
+        Independent installs run on a pool of ``self.jobs`` threads; results
+        are in a fixed order (by kind, then id) after the unchanged ones.
+        """
+        if target_type not in ('claude-code', 'project', 'claude-desktop'):
+            raise ValueError(f"unknown target type: {target_type}")
+        if mode not in INSTALL_MODES:
+            raise ValueError(f"unknown install mode: {mode}")
+
+        with self.timings.span('plan'):
+            plan = self.plan_install(target_dir, target_type, mode)
+        pending = [(e.kind, e.component_id) for e in plan if e.action != 'unchanged']
+        unchanged = [
+            ComponentResult(e.kind, e.component_id, 'unchanged')
+            for e in plan if e.action == 'unchanged'
+        ]
+
+        # Remember the target for --watch and update.sh
+        self.register_target(target_dir, target_type)
+
+        if not pending:
+            return InstallReport(target_dir, target_type, mode, unchanged)
+
+        # Create backup before installing
+        backup = self.create_backup(target_dir)
+
+        chains = self._install_tasks(target_dir, target_type, mode, pending)
+        with self.timings.span('install'):
+            if self.jobs > 1 and len(chains) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.jobs, len(chains))) as pool:
+                    chain_results = list(pool.map(self._run_chain, chains))
+            else:
+                chain_results = [self._run_chain(chain) for chain in chains]
+
+        results = [result for chain in chain_results for result in chain]
+        results.sort(key=lambda r: (COMPONENT_KINDS.index(r.kind), r.component_id))
+
+        # Record what is now installed
+        planned = {(e.kind, e.component_id): e.state for e in plan}
+        with self.timings.span('state write'), locked_file(target_dir / INSTALL_STATE_FILE, target_dir / LOCKS_DIR):
+            state = self.load_install_state(target_dir)
+            state['target_type'] = target_type
+            for result in results:
+                if result.status == 'installed':
+                    entry = planned[(result.kind, result.component_id)]
+                    self._record_dest_stats(entry, target_dir)
+                    state['components'][f"{result.kind}:{result.component_id}"] = entry
+            self.save_install_state(target_dir, state)
+
+        return InstallReport(target_dir, target_type, mode, unchanged + results, backup)
+
+    def _record_dest_stats(self, entry: Dict, target_dir: Path):
+        """Add the installed files' stats to a copied component's state entry."""
+        if entry.get('mode') in ('merge', 'symlink') or 'files' not in entry:
+            return
+        try:
+            stats = scan_files(self.component_dest(entry['kind'], entry['id'], target_dir))
+        except OSError:
+            return
+        for rel, record in entry['files'].items():
+            if rel in stats:
+                record['dest'] = stat_key(stats[rel])
+
+    def _record_source(self, entry: Dict, source: Path):
+        """Re-record a component's source hash and per-file hashes and stats."""
+        digest, file_hashes = hash_source(source)
+        source_stats = scan_files(source)
+        entry['hash'] = digest
+        entry['files'] = {
+            rel: {'sha256': file_hash, 'source': stat_key(source_stats[rel])}
+            for rel, file_hash in file_hashes.items() if rel in source_stats
+        }
+
+    def _file_drift(self, root: Path, files: Dict[str, Dict], side: str) -> Optional[Tuple[str, str]]:
+        """Compare a component tree against its recorded files.
+
+        Files whose (size, mtime, inode) still match the stats recorded under
+        ``side`` ('source' or 'dest') are trusted; only the others are hashed.
+        Stats of files whose content turns out unchanged are refreshed in
+        place. Returns ('dangling' or 'changed', reason), or None.
+        """
+        current = scan_files(root)
+        base = root if root.is_dir() and not root.is_symlink() else root.parent
+
+        removed = sorted(set(files) - set(current))
+        if removed:
+            return 'changed', f"{removed[0]} removed"
+        added = sorted(set(current) - set(files))
+        if added:
+            return 'changed', f"{added[0]} added"
+
+        for rel, record in sorted(files.items()):
+            st = current[rel]
+            if side == 'dest' and stat.S_ISLNK(st.st_mode) and not (base / rel).exists():
+                return 'dangling', f"{rel} is a broken symlink"
+            if record.get(side) == stat_key(st):
+                continue
+            try:
+                if file_sha256(base / rel) != record['sha256']:
+                    return 'changed', f"{rel} changed"
+            except OSError as e:
+                return 'changed', f"{rel} unreadable: {e.strerror}"
+            record[side] = stat_key(st)
+        return None
+
+    def verify_component(self, entry: Dict, target_dir: Path, target_type: str,
+                         merged: Dict[str, Callable[[], object]]) -> VerifyResult:
+        """Check one recorded component against the target and the repo.
+
+        ``merged`` lazily provides the hook fingerprints in settings.json
+        ('hooks') and the MCP server table ('mcp') of the target.
+        """
+        kind, component_id, mode = entry['kind'], entry['id'], entry.get('mode', '')
+        source = self.component_source(kind, component_id, target_type)
+
+        def result(status: str, reason: str = '') -> VerifyResult:
+            return VerifyResult(kind, component_id, status, reason, mode)
+
+        if kind == 'hook' and source.exists():
+            with open(source) as f:
+                required = hook_fingerprints(json.load(f))
+            if not required <= merged['hooks']():
+                return result('missing', 'handlers not in settings.json')
+        elif kind == 'mcp' and source.exists():
+            with open(source) as f:
+                servers = json.load(f).get('mcpServers', {})
+            installed = merged['mcp']()
+            absent = sorted(name for name in servers if name not in installed)
+            if absent:
+                return result('missing', f"server {absent[0]} not configured")
+            changed = sorted(name for name in servers if installed[name] != servers[name])
+            if changed:
+                return result('modified', f"server {changed[0]} edited")
+        elif kind not in ('hook', 'mcp'):
+            dest = self.component_dest(kind, component_id, target_dir)
+            try:
+                dest_stat = os.lstat(dest)
+            except FileNotFoundError:
+                return result('missing', 'not in target')
+
+            if mode == 'symlink':
+                if not stat.S_ISLNK(dest_stat.st_mode):
+                    return result('modified', 'symlink replaced by a local copy')
+                if Path(os.readlink(dest)) != source:
+                    return result('modified', f"links to {os.readlink(dest)}")
+                if not dest.exists():
+                    return result('dangling', 'link target is gone')
+            elif stat.S_ISLNK(dest_stat.st_mode):
+                return result('modified', 'replaced by a symlink')
+            elif 'files' in entry:
+                drift = self._file_drift(dest, entry['files'], 'dest')
+                if drift:
+                    return result('dangling' if drift[0] == 'dangling' else 'modified', drift[1])
+            elif hash_source(dest)[0] != entry.get('hash'):
+                # State written before per-file stats were recorded
+                return result('modified', 'contents differ from install')
+
+        # Has the repository moved on since the install?
+        if not source.exists():
+            return result('outdated', 'removed from repository')
+        if mode == 'symlink':
+            # The link already serves the repo's current files; just record them
+            if 'files' not in entry or self._file_drift(source, entry['files'], 'source'):
+                self._record_source(entry, source)
+        elif 'files' in entry:
+            drift = self._file_drift(source, entry['files'], 'source')
+            if drift:
+                return result('outdated', f"source {drift[1]}")
+        elif hash_source(source)[0] != entry.get('hash'):
+            return result('outdated', 'source changed')
+
+        version = self.component_version(kind, component_id, target_type)
+        if version and entry.get('version') != version:
+            return result('outdated', f"version {entry.get('version')} -> {version}")
+        return result('ok')
+
+    def verify_install(self, target_dir: Path) -> Optional[List[VerifyResult]]:
+        """Check every component recorded in a target's install state.
+
+        Returns None if nothing was ever installed there by this script.
+        Refreshed file stats are written back, so the next run stays on the
+        stat-only fast path.
+        """
+        state_path = target_dir / INSTALL_STATE_FILE
+        if not state_path.exists():
+            return None
 
-        self.backup_dir = backup_dir
-        return backup_dir
+        with self.timings.span('verify'), locked_file(state_path, target_dir / LOCKS_DIR):
+            state = self.load_install_state(target_dir)
+            target_type = state.get('target_type', 'claude-code')
+            cache = {}
 
-    def list_backups(self, target_dir: Path) -> List[Path]:
-        """List available backups."""
-        backups_dir = target_dir / '.backups'
-        if not backups_dir.exists():
+            def settings_fingerprints() -> Set[str]:
+                if 'hooks' not in cache:
+                    cache['hooks'] = hook_fingerprints(self._read_config(target_dir / "settings.json"))
+                return cache['hooks']
+
+            def mcp_servers() -> Dict:
+                if 'mcp' not in cache:
+                    if target_type == 'claude-desktop':
+                        config = self._read_config(target_dir / "claude_desktop_config.json")
+                    else:
+                        config = self._read_config(target_dir.parent / ".mcp.json")
+                    cache['mcp'] = config.get('mcpServers', {})
+                return cache['mcp']
+
+            merged = {'hooks': settings_fingerprints, 'mcp': mcp_servers}
+            results = []
+            for entry in state['components'].values():
+                try:
+                    results.append(self.verify_component(entry, target_dir, target_type, merged))
+                except (OSError, ValueError) as e:
+                    results.append(VerifyResult(entry['kind'], entry['id'], 'modified', str(e), entry.get('mode', '')))
+            self.save_install_state(target_dir, state)
+
+        results.sort(key=lambda r: (COMPONENT_KINDS.index(r.kind), r.component_id))
+        return results
+
+    def _read_config(self, path: Path) -> Dict:
+        """Read a JSON config file, treating a missing file as empty."""
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def repair_install(self, target_dir: Path, results: List[VerifyResult]) -> List[InstallReport]:
+        """Reinstall only the components that verify_install flagged.
+
+        Components are reinstalled in the mode they were installed with;
+        local modifications are backed up first, in a single backup of the
+        target taken before any mode batch runs (see reinstall).
+        """
+        broken = [(r.kind, r.component_id, r.mode) for r in results if not r.ok]
+        if not broken:
+            return []
+        target_type = self.load_install_state(target_dir).get('target_type', 'claude-code')
+        return self.reinstall(target_dir, target_type, broken, force=True)
+
+    def reinstall(self, target_dir: Path, target_type: str, components: List[Tuple[str, str, str]],
+                  force: bool = False) -> List[InstallReport]:
+        """Install (kind, id, mode) components into a target, one batch per mode.
+
+        Hook and MCP merges (mode 'merge') do not depend on the file mode, so
+        they run with the first batch. Only the first batch that installs
+        anything takes a backup; it covers the whole target, so it is the
+        state from before every batch.
+        """
+        by_mode: Dict[str, List[Tuple[str, str]]] = {}
+        merges = []
+        for kind, component_id, mode in components:
+            (merges if mode == 'merge' else by_mode.setdefault(mode, [])).append((kind, component_id))
+        batches = list(by_mode.items()) or [('symlink', [])]
+        batches[0][1].extend(merges)
+
+        reports = []
+        for mode, batch in batches:
+            child = self.spawn()
+            child.force = force
+            child.no_backup = self.no_backup or any(report.backup for report in reports)
+            selections = {
+                'skill': child.selected_skills,
+                'agent': child.selected_agents,
+                'command': child.selected_commands,
+                'hook': child.selected_hooks,
+                'mcp': child.selected_mcp,
+            }
+            for kind, component_id in batch:
+                selections[kind].add(component_id)
+            reports.append(child.do_install(target_dir, target_type, mode))
+        return reports
+
+    @property
+    def targets_path(self) -> Path:
+        return self.repo_dir / ".cache" / TARGETS_FILE
+
+    def register_target(self, target_dir: Path, target_type: str):
+        """Record a target in the repo's registry of install targets."""
+        self.targets_path.parent.mkdir(parents=True, exist_ok=True)
+        with locked_file(self.targets_path, self.targets_path.parent / 'locks'):
+            registry = self._read_config(self.targets_path)
+            targets = registry.setdefault('targets', {})
+            key = str(target_dir.resolve())
+            if targets.get(key, {}).get('target_type') != target_type:
+                targets[key] = {'target_type': target_type}
+                write_json_file(self.targets_path, registry, sort_keys=True)
+
+    def registered_targets(self) -> List[Path]:
+        """Return registered targets that still have an install state."""
+        try:
+            targets = self._read_config(self.targets_path).get('targets', {})
+        except ValueError:
+            return []
+        return [Path(path) for path in sorted(targets) if (Path(path) / INSTALL_STATE_FILE).exists()]
+
+    def sync_component(self, entry: Dict, target_dir: Path) -> List[str]:
+        """Bring a copied component up to date file by file.
+
+        Files whose source stats match the install state are skipped without
+        reading them; changed files are copied to a temporary name and
+        renamed over the installed copy, and files removed from the repo are
+        removed from the target. Updates entry in place and returns the
+        relative paths that were synced.
+        """
+        source = self.component_source(entry['kind'], entry['id'])
+        dest = self.component_dest(entry['kind'], entry['id'], target_dir)
+        files = entry.get('files')
+        if files is None or not source.exists() or not dest.exists() or dest.is_symlink():
+            # Not recorded per file, or gone on either side: leave it to --repair
             return []
-        return sorted(backups_dir.glob('backup-*'), key=lambda p: p.name, reverse=True)
 
-    def restore_backup(self, target_dir: Path) -> bool:
-        """Restore from a previous backup."""
-        backups = self.list_backups(target_dir)
+        copy_function = COPY_FUNCTIONS[entry['mode']]
+        src_base = source if source.is_dir() else source.parent
+        dest_base = dest if dest.is_dir() else dest.parent
+        current = scan_files(source)
+        synced = []
+
+        for rel in sorted(current.keys() | files.keys()):
+            record = files.get(rel)
+            src_stat = current.get(rel)
+            dest_file = dest_base / rel
+
+            if src_stat is None:
+                if dest_file.is_symlink() or dest_file.exists():
+                    dest_file.unlink()
+                del files[rel]
+                synced.append(f"{rel} (removed)")
+                continue
+            if record and record.get('source') == stat_key(src_stat):
+                continue
+
+            file_hash = file_sha256(src_base / rel)
+            if record and record['sha256'] == file_hash and dest_file.exists():
+                # Touched but not changed
+                record['source'] = stat_key(src_stat)
+                continue
+
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest_file.with_name(f".{dest_file.name}.sync-{os.getpid()}")
+            try:
+                copy_function(src_base / rel, tmp)
+                os.replace(tmp, dest_file)
+            finally:
+                if tmp.exists():
+                    tmp.unlink()
+            files[rel] = {
+                'sha256': file_hash,
+                'source': stat_key(src_stat),
+                'dest': stat_key(os.lstat(dest_file)),
+            }
+            synced.append(rel)
+
+        if synced:
+            entry['hash'] = combine_digests({rel: record['sha256'] for rel, record in files.items()})
+        return synced
+
+    def sync_changes(self, changed: Optional[Set[Path]] = None) -> List[SyncResult]:
+        """Propagate changed repo files to every registered target.
+
+        ``changed`` limits the sync to the components those paths belong to;
+        None checks every recorded component. Copied skills, agents and
+        commands are synced per file, and changed hooks are re-merged into
+        settings.json. Returns one result per synced file or failed component.
+        """
+        affected = None
+        if changed is not None:
+            affected = set()
+            for path in changed:
+                try:
+                    parts = path.relative_to(self.repo_dir).parts
+                except ValueError:
+                    continue
+                if len(parts) >= 2 and parts[0] in ('skills', 'hooks'):
+                    affected.add((parts[0][:-1], parts[1]))
+                elif len(parts) == 2 and parts[0] in ('agents', 'commands') and parts[1].endswith('.md'):
+                    affected.add((parts[0][:-1], parts[1][:-3]))
+            if not affected:
+                return []
+
+        synced_files = []
+        for target_dir in self.registered_targets():
+            with locked_file(target_dir / INSTALL_STATE_FILE, target_dir / LOCKS_DIR):
+                state = self.load_install_state(target_dir)
+                for entry in state['components'].values():
+                    component = (entry['kind'], entry['id'])
+                    if affected is not None and component not in affected:
+                        continue
+                    try:
+                        if entry['kind'] == 'hook':
+                            source = self.component_source('hook', entry['id'])
+                            if source.exists() and hash_source(source)[0] != entry['hash']:
+                                self.install_hooks([entry['id']], target_dir)
+                                entry['hash'] = hash_source(source)[0]
+                                entry['handlers'] = hook_handlers(source)
+                                synced = ['settings.json']
+                            else:
+                                synced = []
+                        elif entry['mode'] in COPY_FUNCTIONS:
+                            synced = self.sync_component(entry, target_dir)
+                        else:
+                            continue
+                    except (OSError, ValueError) as e:
+                        synced_files.append(SyncResult(entry['kind'], entry['id'], target_dir, '', str(e)))
+                        continue
+                    synced_files.extend(SyncResult(entry['kind'], entry['id'], target_dir, rel) for rel in synced)
+                self.save_install_state(target_dir, state)
+        return synced_files
+
+    def changed_paths(self, since: str) -> List[str]:
+        """Return repo paths changed between a revision and HEAD (git diff)."""
+        output = subprocess.run(
+            ['git', '-C', str(self.repo_dir), 'diff', '--name-only', '--no-renames', '-z', since, 'HEAD'],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        return [path for path in output.split('\0') if path]
+
+    def components_for_paths(self, paths: List[str]) -> Set[Tuple[str, str]]:
+        """Map repo paths to the (catalog section, id) pairs they belong to.
+
+        A path belongs to a component if it is the component's catalog path
+        or lies inside it (skill and hook directories).
+        """
+        owners = {}
+        for section in self.index.sections:
+            for entry in self.index.sections[section]:
+                if entry.get('path'):
+                    owners[entry['path'].rstrip('/')] = (section, entry['id'])
+
+        affected = set()
+        for path in paths:
+            parts = path.split('/')
+            for depth in range(len(parts), 0, -1):
+                owner = owners.get('/'.join(parts[:depth]))
+                if owner:
+                    affected.add(owner)
+                    break
+        return affected
+
+    def update_from(self, since: str) -> UpdateReport:
+        """Reinstall, in every registered target, the components changed since a revision.
+
+        Components are matched through catalog.json paths; a change to
+        catalog.json itself also picks up components whose version changed.
+        Each target keeps the mode its components were installed with.
+        """
+        paths = self.changed_paths(since)
+        affected = self.components_for_paths(paths)
+        catalog_changed = 'catalog.json' in paths
+        report = UpdateReport(since, paths, sorted(affected), self.registered_targets())
+
+        for target_dir in report.targets:
+            state = self.load_install_state(target_dir)
+            target_type = state.get('target_type', 'claude-code')
+            components = []
+            for entry in state['components'].values():
+                if entry['kind'] == 'mcp':
+                    section = 'mcp/claude-desktop' if target_type == 'claude-desktop' else 'mcp/claude-code'
+                else:
+                    section = KIND_SECTIONS[entry['kind']]
+                outdated = catalog_changed and entry.get('version') != self.component_version(
+                    entry['kind'], entry['id'], target_type)
+                if (section, entry['id']) in affected or outdated:
+                    components.append((entry['kind'], entry['id'], entry['mode']))
+
+            if components:
+                report.reports.extend(self.reinstall(target_dir, target_type, components))
+        return report
 
-        if not backups:
-            print(color("No backups found", Colors.YELLOW))
+    def load_preset(self, preset_name: str):
+        """Load a preset configuration."""
+        preset = self.index.presets.get(preset_name)
+        if preset is None:
             return False
+        self.selected_skills = set(preset.get('skills', []))
+        self.selected_agents = set(preset.get('agents', []))
+        self.selected_hooks = set(preset.get('hooks', []))
+        self.selected_commands = set(preset.get('commands', []))
+        self.selected_mcp = set(preset.get('mcp', []))
+        return True
+
+    def select_from_spec(self, spec: Dict) -> Optional[str]:
+        """Select a preset and/or explicit components from a lockfile entry.
+
+        Returns an error message, or None if the selection is valid.
+        """
+        preset = spec.get('preset')
+        if preset and not self.load_preset(preset):
+            return f"preset not found: {preset}"
+        self.selected_skills |= set(spec.get('skills', []))
+        self.selected_agents |= set(spec.get('agents', []))
+        self.selected_hooks |= set(spec.get('hooks', []))
+        self.selected_commands |= set(spec.get('commands', []))
+        self.selected_mcp |= set(spec.get('mcp', []))
+        return None
 
-        print(color("\nAvailable backups:", Colors.BLUE))
-        for i, backup in enumerate(backups, 1):
-            print(f"  {i}. {backup.name}")
+    def load_fleet_lockfile(self, lockfile: Path) -> List[Dict]:
+        """Read a fleet lockfile into one spec per project.
+
+        The lockfile is JSON with an optional ``defaults`` object and a
+        ``projects`` list. Each project is an object with a ``path`` (relative
+        paths are resolved against the lockfile's directory) plus any of
+        ``preset``, ``skills``, ``agents``, ``hooks``, ``commands``, ``mcp``
+        and ``mode``; missing keys fall back to ``defaults``. A bare string is
+        shorthand for ``{"path": <string>}``. An entry of any other type, or
+        without a path or with an unknown mode, gets an ``error`` instead of
+        being installed.
+        """
+        with open(lockfile) as f:
+            data = json.load(f)
+
+        defaults = data.get('defaults', {})
+        specs = []
+        for index, project in enumerate(data.get('projects', [])):
+            spec = dict(defaults)
+            if isinstance(project, str):
+                project = {'path': project}
+            if not isinstance(project, dict):
+                spec['path'] = Path(f"{lockfile}: projects[{index}]")
+                spec['error'] = 'project entry must be an object or a path string'
+                specs.append(spec)
+                continue
+            spec.update(project)
+
+            raw_path = spec.get('path')
+            if not isinstance(raw_path, str) or not raw_path:
+                spec['path'] = Path(f"{lockfile}: projects[{index}]")
+                spec['error'] = "missing 'path'"
+                specs.append(spec)
+                continue
+            path = Path(raw_path).expanduser()
+            if not path.is_absolute():
+                path = lockfile.parent / path
+            spec['path'] = path
+
+            mode = spec.setdefault('mode', 'symlink')
+            if mode not in INSTALL_MODES:
+                spec['error'] = f"unknown mode {mode!r} (expected one of {', '.join(INSTALL_MODES)})"
+            specs.append(spec)
+        return specs
+
+    def install_project(self, spec: Dict) -> ProjectResult:
+        """Install a lockfile entry into <path>/.claude with its own installer."""
+        start = time.perf_counter()
+        project = self.spawn()
+        project.jobs = 1
+        target_dir = spec['path'] / '.claude'
+
+        error = spec.get('error') or project.select_from_spec(spec)
+        if error:
+            return ProjectResult(spec['path'], time.perf_counter() - start, [], error)
+        if not spec['path'].is_dir():
+            return ProjectResult(spec['path'], time.perf_counter() - start, [], 'project directory not found')
 
         try:
-            choice = input(f"\nSelect backup to restore (1-{len(backups)}): ").strip()
-            idx = int(choice) - 1
-
-            if 0 <= idx < len(backups):
-                selected_backup = backups[idx]
-                print(color(f"\nRestoring from: {selected_backup}", Colors.BLUE))
-
-                # Restore directories
-                for subdir in ['skills', 'agents', 'commands', 'hooks']:
-                    backup_subdir = selected_backup / subdir
-                    if backup_subdir.exists():
-                        target_subdir = target_dir / subdir
-                        if target_subdir.exists():
-                            shutil.rmtree(target_subdir)
-                        shutil.copytree(backup_subdir, target_subdir)
-                        print(color(f"  Restored {subdir}/", Colors.GREEN))
-
-                # Restore config files
-                if (selected_backup / 'settings.json').exists():
-                    shutil.copy2(selected_backup / 'settings.json', target_dir / 'settings.json')
-                    print(color("  Restored settings.json", Colors.GREEN))
-
-                if (selected_backup / '.mcp.json').exists():
-                    shutil.copy2(selected_backup / '.mcp.json', target_dir.parent / '.mcp.json')
-                    print(color("  Restored .mcp.json", Colors.GREEN))
-
-                if (selected_backup / 'claude_desktop_config.json').exists():
-                    shutil.copy2(selected_backup / 'claude_desktop_config.json', target_dir / 'claude_desktop_config.json')
-                    print(color("  Restored claude_desktop_config.json", Colors.GREEN))
-
-                print(color("\nRestore complete!", Colors.GREEN + Colors.BOLD))
-                return True
-            else:
-                print(color("Invalid selection", Colors.RED))
-                return False
+            with self.timings.span(f"project {spec['path']}", 'project'):
+                results = project.do_install(target_dir, 'project', spec['mode']).results
+        except (OSError, ValueError) as e:
+            return ProjectResult(spec['path'], time.perf_counter() - start, [], str(e))
+        return ProjectResult(spec['path'], time.perf_counter() - start, results)
+
+    def run_fleet(self, lockfile: Path) -> List[ProjectResult]:
+        """Install every project in a lockfile using a pool of ``self.jobs`` workers.
+
+        The catalog is shared by all projects; results keep lockfile order.
+        """
+        specs = self.load_fleet_lockfile(lockfile)
+        if self.jobs > 1 and len(specs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(specs))) as pool:
+                return list(pool.map(self.install_project, specs))
+        return [self.install_project(spec) for spec in specs]
+
+    def list_components(self, section: Optional[str] = None) -> List[ComponentInfo]:
+        """Return the catalog's components, optionally of one section, in catalog order."""
+        sections = [section] if section else CATALOG_SECTIONS
+        return [ComponentInfo.from_entry(name, entry) for name in sections for entry in self.index.sections[name]]
+
+    def search_components(self, query: str) -> List[ComponentInfo]:
+        """Return components with a tag or words matching query (see CatalogIndex.search)."""
+        return [ComponentInfo.from_entry(section, entry) for section, entry in self.index.search(query)]
+
+
+class FuzzyFilter:
+    """Incremental subsequence filter over precomputed, lowercased haystacks.
+
+    Each typed character only re-examines the survivors of the previous
+    query, continuing every match from where it left off, so one keystroke
+    costs one str.find per remaining candidate. A stack of results makes
+    backspace free.
+    """
+
+    def __init__(self, haystacks: List[str]):
+        self.haystacks = [h.lower() for h in haystacks]
+        self.query = ''
+        # (matching indices, position after each one's match so far)
+        self.stack = [(list(range(len(self.haystacks))), [0] * len(self.haystacks))]
+        self._ranked: Optional[List[int]] = None
+
+    @property
+    def matches(self) -> List[int]:
+        """Indices of matching haystacks, best first.
+
+        Haystacks containing the query as a substring come before scattered
+        subsequence matches; each group keeps the original order.
+        """
+        if self._ranked is None:
+            indices = self.stack[-1][0]
+            needle = self.query.strip().lower()
+            if needle:
+                haystacks = self.haystacks
+                exact = [needle in haystacks[i] for i in indices]
+                indices = ([i for i, hit in zip(indices, exact) if hit] +
+                           [i for i, hit in zip(indices, exact) if not hit])
+            self._ranked = indices
+        return self._ranked
+
+    def push(self, char: str):
+        """Extend the query by one character."""
+        self.query += char
+        self._ranked = None
+        indices, positions = self.stack[-1]
+        if char.isspace():
+            # Spaces separate terms; the remaining characters still match in order
+            self.stack.append((indices, positions))
+            return
+        char = char.lower()
+        haystacks = self.haystacks
+        kept, kept_positions = [], []
+        for index, position in zip(indices, positions):
+            found = haystacks[index].find(char, position)
+            if found != -1:
+                kept.append(index)
+                kept_positions.append(found + 1)
+        self.stack.append((kept, kept_positions))
+
+    def pop(self):
+        """Remove the last character of the query."""
+        if self.query:
+            self.query = self.query[:-1]
+            self.stack.pop()
+            self._ranked = None
+
+    def set_query(self, query: str):
+        """Change the query, reusing results for the common prefix."""
+        common = 0
+        while common < min(len(query), len(self.query)) and query[common] == self.query[common]:
+            common += 1
+        while len(self.query) > common:
+            self.pop()
+        for char in query[common:]:
+            self.push(char)
+
+
+def component_haystack(component: Dict) -> str:
+    """Return the text the fuzzy filter matches a catalog entry against."""
+    return ' '.join([component['id'], component.get('name', ''), component.get('description', ''),
+                     ' '.join(component.get('tags', []))])
+
+
+class CursesMenu:
+    """Scrolling multi-select list drawn with curses.
+
+    Each screen row is remembered as the (text, attribute) segments last
+    drawn there, and only rows whose segments changed are rewritten, so a
+    cursor move repaints two rows rather than the whole list.
+    """
+
+    HELP = "up/down move  pgup/pgdn page  space toggle  / filter  a all  n none  enter done  q quit"
+    FILTER_HELP = "type to filter  backspace erase  ctrl-u clear  up/down move  enter stop typing"
+    HEADER_ROWS = 3
+
+    def __init__(self, stdscr, title: str, options: List[Tuple[str, str, str]], selected: Set[str],
+                 haystacks: Optional[List[str]] = None):
+        self.stdscr = stdscr
+        self.title = title
+        self.options = options
+        self.selected = set(selected)
+        self.filter = FuzzyFilter(haystacks if haystacks is not None else [' '.join(o) for o in options])
+        self.typing = False
+        self.cursor = 0
+        self.top = 0
+        self.rows: Dict[int, Tuple] = {}
 
-        except (ValueError, KeyboardInterrupt):
-            print(color("Restore cancelled", Colors.YELLOW))
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        stdscr.keypad(True)
+        stdscr.idlok(True)
+        self.attrs = {'title': curses.A_BOLD, 'dim': curses.A_DIM, 'name': curses.A_NORMAL, 'on': curses.A_BOLD}
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            curses.init_pair(1, curses.COLOR_CYAN, -1)
+            curses.init_pair(2, curses.COLOR_GREEN, -1)
+            self.attrs.update(title=curses.color_pair(1) | curses.A_BOLD, name=curses.color_pair(1),
+                              on=curses.color_pair(2) | curses.A_BOLD)
+
+    @property
+    def page_size(self) -> int:
+        height, _ = self.stdscr.getmaxyx()
+        return max(1, height - self.HEADER_ROWS - 1)
+
+    @property
+    def visible(self) -> List[int]:
+        """Indices into options of the entries matching the filter."""
+        return self.filter.matches
+
+    def _option_row(self, index: int) -> Tuple:
+        key, name, desc = self.options[self.visible[index]]
+        checked = key in self.selected
+        highlight = curses.A_REVERSE if index == self.cursor else 0
+        return (
+            ('> ' if index == self.cursor else '  ', highlight),
+            ('[x] ' if checked else '[ ] ', (self.attrs['on'] if checked else self.attrs['dim']) | highlight),
+            (name, self.attrs['name'] | highlight),
+            (f" - {desc}", highlight),
+        )
+
+    def _status_row(self) -> Tuple:
+        status = [(f"{len(self.selected)} of {len(self.options)} selected", self.attrs['dim'])]
+        if self.typing or self.filter.query:
+            status.append((f"   filter: {self.filter.query}", self.attrs['title']))
+            status.append(('_' if self.typing else '', self.attrs['title']))
+            status.append((f"  ({len(self.visible)} matching)", self.attrs['dim']))
+        return tuple(status)
+
+    def render(self) -> Dict[int, Tuple]:
+        """Return the segments every screen row should show."""
+        height, _ = self.stdscr.getmaxyx()
+        visible = self.visible
+        rows = {
+            0: ((self.title, self.attrs['title']),),
+            1: ((self.FILTER_HELP if self.typing else self.HELP, self.attrs['dim']),),
+            2: self._status_row(),
+        }
+        for offset in range(self.page_size):
+            index = self.top + offset
+            rows[self.HEADER_ROWS + offset] = self._option_row(index) if index < len(visible) else ()
+        rows[height - 1] = ((f"{self.cursor + 1}/{len(visible)}", self.attrs['dim']),) if visible else ()
+        return rows
+
+    def draw(self):
+        """Rewrite only the rows whose contents changed since the last draw."""
+        _, width = self.stdscr.getmaxyx()
+        for y, segments in self.render().items():
+            if self.rows.get(y) == segments:
+                continue
+            self.stdscr.move(y, 0)
+            self.stdscr.clrtoeol()
+            x = 0
+            for text, attr in segments:
+                room = width - 1 - x
+                if room <= 0:
+                    break
+                self.stdscr.addnstr(y, x, text, room, attr)
+                x += min(len(text), room)
+            self.rows[y] = segments
+        self.stdscr.refresh()
+
+    def move(self, delta: int):
+        visible = self.visible
+        if not visible:
+            self.cursor = self.top = 0
+            return
+        self.cursor = max(0, min(len(visible) - 1, self.cursor + delta))
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + self.page_size:
+            self.top = self.cursor - self.page_size + 1
+
+    def refilter(self, query: str):
+        """Apply a new filter query and return to the top of the matches."""
+        self.filter.set_query(query)
+        self.cursor = self.top = 0
+
+    def edit_filter(self, key: int) -> bool:
+        """Handle a key while typing a filter; return False if it was not a filter key."""
+        if key in (curses.KEY_BACKSPACE, 127, 8):
+            if self.filter.query:
+                self.refilter(self.filter.query[:-1])
+            else:
+                self.typing = False
+        elif key == 21:  # ctrl-u
+            self.refilter('')
+        elif key in (curses.KEY_ENTER, 10, 13):
+            self.typing = False
+        elif 32 <= key < 127:
+            if key != 32 or self.filter.query:
+                self.refilter(self.filter.query + chr(key))
+        else:
             return False
+        return True
+
+    def run(self) -> Optional[Set[str]]:
+        """Run the menu; return the selection, or None if the user quit."""
+        moves = {
+            curses.KEY_UP: -1, ord('k'): -1,
+            curses.KEY_DOWN: 1, ord('j'): 1,
+        }
+        while True:
+            self.draw()
+            key = self.stdscr.getch()
+            if self.typing and self.edit_filter(key):
+                continue
+            visible = self.visible
+            page = self.page_size
+            if key in moves:
+                self.move(moves[key])
+            elif key == curses.KEY_PPAGE:
+                self.move(-page)
+            elif key == curses.KEY_NPAGE:
+                self.move(page)
+            elif key == curses.KEY_HOME:
+                self.move(-len(visible))
+            elif key == curses.KEY_END:
+                self.move(len(visible))
+            elif key == ord(' ') and visible:
+                self.selected ^= {self.options[visible[self.cursor]][0]}
+            elif key == ord('/'):
+                self.typing = True
+            elif key in (curses.KEY_BACKSPACE, 127, 8) and self.filter.query:
+                self.refilter('')
+            elif key == ord('a'):
+                self.selected |= {self.options[i][0] for i in visible}
+            elif key == ord('n'):
+                self.selected -= {self.options[i][0] for i in visible}
+            elif key in (curses.KEY_ENTER, 10, 13, ord('d')):
+                return self.selected
+            elif key == ord('q'):
+                return None
+            elif key == curses.KEY_RESIZE:
+                self.rows = {}
+                self.stdscr.clear()
+                self.move(0)
+
+
+class InstallerTUI(Installer):
+    """Command-line and interactive front end over the Installer library.
+
+    Everything that prints, prompts or exits lives here.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Full-screen curses menus when on a terminal that supports them
+        self.use_curses = curses is not None and sys.stdin.isatty() and sys.stdout.isatty()
 
     def print_banner(self):
         """Print the installer banner."""
@@ -231,7 +2696,7 @@ class Installer:
     def get_user_selection(self, prompt: str, max_val: int) -> Optional[str]:
         """Get user input for menu selection."""
         print()
-        print(f"  {color('a', Colors.YELLOW)} = select all | {color('n', Colors.YELLOW)} = select none | {color('d', Colors.YELLOW)} = done | {color('q', Colors.YELLOW)} = quit")
+        print(f"  {color('a', Colors.YELLOW)} = select all | {color('n', Colors.YELLOW)} = select none | {color('/text', Colors.YELLOW)} = filter | {color('d', Colors.YELLOW)} = done | {color('q', Colors.YELLOW)} = quit")
 
         try:
             choice = input(f"\n{prompt}: ").strip().lower()
@@ -242,26 +2707,44 @@ class Installer:
     def select_components(self, title: str, components: List[Dict], selected: Set[str]) -> Set[str]:
         """Interactive component selection."""
         options = [(c['id'], c['name'], c['description']) for c in components]
+        haystacks = [component_haystack(c) for c in components]
+
+        if self.use_curses:
+            try:
+                result = curses.wrapper(lambda stdscr: CursesMenu(stdscr, title, options, selected, haystacks).run())
+            except curses.error:
+                # Terminal without the needed capabilities: use the line menu
+                self.use_curses = False
+            else:
+                if result is None:
+                    sys.exit(0)
+                return result
 
+        matcher = FuzzyFilter(haystacks)
         while True:
+            visible = [components[i] for i in matcher.matches]
             clear_screen()
             self.print_banner()
-            self.print_menu(title, options, selected)
+            self.print_menu(title, [options[i] for i in matcher.matches], selected)
+            if matcher.query:
+                print(color(f"\n  Filter: {matcher.query} ({len(visible)} of {len(components)})", Colors.DIM))
 
-            choice = self.get_user_selection("Toggle selection (number/a/n/d/q)", len(options))
+            choice = self.get_user_selection("Toggle selection (number/a/n/d/q, /text to filter)", len(visible))
 
             if choice == 'q':
                 sys.exit(0)
             elif choice == 'd':
                 return selected
             elif choice == 'a':
-                selected = {c['id'] for c in components}
+                selected = selected | {c['id'] for c in visible}
             elif choice == 'n':
-                selected = set()
+                selected = selected - {c['id'] for c in visible}
+            elif choice.startswith('/'):
+                matcher.set_query(choice[1:].strip())
             elif choice.isdigit():
                 idx = int(choice) - 1
-                if 0 <= idx < len(components):
-                    comp_id = components[idx]['id']
+                if 0 <= idx < len(visible):
+                    comp_id = visible[idx]['id']
                     if comp_id in selected:
                         selected.remove(comp_id)
                     else:
@@ -271,7 +2754,7 @@ class Installer:
 
     def select_hooks_with_security(self) -> Set[str]:
         """Select hooks with security warnings."""
-        hooks = self.catalog['components'].get('hooks', [])
+        hooks = self.index.sections['hooks']
         selected = set()
 
         for hook in hooks:
@@ -283,26 +2766,11 @@ class Installer:
             print(f"Description: {hook['description']}")
             print(f"Security Level: {color(hook['securityLevel'], Colors.YELLOW if hook['securityLevel'] == 'LOW' else Colors.RED)}")
 
-            # Read hook README for security details
-            hook_readme = self.repo_dir / hook['path'] / "README.md"
-            if hook_readme.exists():
-                content = hook_readme.read_text()
-                # Extract commands section
-                if "Commands executed:" in content:
-                    start = content.find("Commands executed:")
-                    end = content.find("```", content.find("```", start) + 3)
-                    if start != -1 and end != -1:
-                        commands_section = content[start:end + 3]
-                        print(f"\n{color('Commands that will be executed:', Colors.YELLOW)}")
-                        # Print just the code block
-                        code_start = commands_section.find("```")
-                        code_end = commands_section.find("```", code_start + 3)
-                        if code_start != -1:
-                            code = commands_section[code_start+3:code_end].strip()
-                            if code.startswith("bash\n"):
-                                code = code[5:]
-                            for line in code.split("\n"):
-                                print(f"  {color(line, Colors.DIM)}")
+            # Listing compiled into catalog.json by scripts/build_catalog.py
+            if hook.get('commands'):
+                print(f"\n{color('Commands that will be executed:', Colors.YELLOW)}")
+                for line in hook['commands']:
+                    print(f"  {color(line, Colors.DIM)}")
 
             print()
             choice = input(f"Install {hook['name']}? (y/N/q to quit): ").strip().lower()
@@ -348,241 +2816,255 @@ class Installer:
         print("-" * 40)
         print(f"  1. {color('Symlink', Colors.CYAN)} - Link to repo (easy updates via git pull)")
         print(f"  2. {color('Copy', Colors.CYAN)} - Copy files (standalone, no repo dependency)")
+        print(f"  3. {color('Hardlink', Colors.CYAN)} - Hardlink files (standalone, no extra disk; same filesystem)")
+        print(f"  4. {color('Reflink', Colors.CYAN)} - Copy-on-write clone where supported, else copy")
 
-        choice = input("\nSelect mode (1-2, default=1): ").strip()
-
-        return 'copy' if choice == '2' else 'symlink'
+        choice = input("\nSelect mode (1-4, default=1): ").strip()
 
-    def install_skill(self, skill_id: str, target_dir: Path, mode: str):
-        """Install a skill."""
-        source = self.repo_dir / "skills" / skill_id
-        dest = target_dir / "skills" / skill_id
-
-        if not source.exists():
-            print(color(f"  Skill not found: {skill_id}", Colors.YELLOW))
-            return
-
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        if dest.exists():
-            if dest.is_symlink():
-                dest.unlink()
-            else:
-                shutil.rmtree(dest)
-
-        if mode == 'symlink':
-            dest.symlink_to(source)
-        else:
-            shutil.copytree(source, dest)
+        return {'2': 'copy', '3': 'hardlink', '4': 'reflink'}.get(choice, 'symlink')
 
-        print(color(f"  Installed skill: {skill_id}", Colors.GREEN))
-
-    def install_agent(self, agent_id: str, target_dir: Path, mode: str):
-        """Install an agent."""
-        source = self.repo_dir / "agents" / f"{agent_id}.md"
-        dest = target_dir / "agents" / f"{agent_id}.md"
-
-        if not source.exists():
-            print(color(f"  Agent not found: {agent_id}", Colors.YELLOW))
-            return
-
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        if dest.exists():
-            dest.unlink()
+    def print_plan(self, target_dir: Path, plan: List[PlanEntry]):
+        """Print the changes an install would make to a target."""
+        print(color(f"\nPlan for: {target_dir}", Colors.CYAN))
+        print("-" * 40)
 
-        if mode == 'symlink':
-            dest.symlink_to(source)
+        symbols = {
+            'install': ('+', Colors.GREEN),
+            'update': ('~', Colors.YELLOW),
+            'unchanged': ('=', Colors.DIM),
+            'missing': ('!', Colors.RED),
+        }
+        for entry in plan:
+            symbol, symbol_color = symbols[entry.action]
+            line = f"  {symbol} {COMPONENT_LABELS[entry.kind]} {entry.component_id}"
+            if entry.reason:
+                line += f" ({entry.reason})"
+            print(color(line, symbol_color))
+
+        counts = {action: sum(1 for e in plan if e.action == action) for action in symbols}
+        print(f"\n{counts['install']} to install, {counts['update']} to update, "
+              f"{counts['unchanged']} unchanged, {counts['missing']} not found")
+
+    def print_result(self, result: ComponentResult):
+        """Print the outcome of a single component install."""
+        label = COMPONENT_LABELS[result.kind]
+        if result.status == 'installed':
+            print(color(f"  Installed {label}: {result.component_id}", Colors.GREEN))
+        elif result.status == 'missing':
+            print(color(f"  {label[:1].upper() + label[1:]} not found: {result.component_id}", Colors.YELLOW))
         else:
-            shutil.copy2(source, dest)
-
-        print(color(f"  Installed agent: {agent_id}", Colors.GREEN))
-
-    def install_hook(self, hook_id: str, target_dir: Path):
-        """Install a hook by merging settings.json."""
-        source_settings = self.repo_dir / "hooks" / hook_id / "settings.json"
-        target_settings = target_dir / "settings.json"
-
-        if not source_settings.exists():
-            print(color(f"  Hook not found: {hook_id}", Colors.YELLOW))
-            return
+            print(color(f"  Failed to install {label} {result.component_id}: {result.detail}", Colors.RED))
 
-        target_dir.mkdir(parents=True, exist_ok=True)
-
-        # Load existing settings
-        existing = {}
-        if target_settings.exists():
-            with open(target_settings) as f:
-                existing = json.load(f)
-
-        # Load hook settings
-        with open(source_settings) as f:
-            hook_settings = json.load(f)
-
-        # Merge hooks
-        existing.setdefault('hooks', {})
-        for event, handlers in hook_settings.get('hooks', {}).items():
-            existing['hooks'].setdefault(event, []).extend(handlers)
-
-        # Write merged settings
-        with open(target_settings, 'w') as f:
-            json.dump(existing, f, indent=2)
-
-        print(color(f"  Installed hook: {hook_id}", Colors.GREEN))
-
-    def install_command(self, command_id: str, target_dir: Path, mode: str):
-        """Install a command."""
-        source = self.repo_dir / "commands" / f"{command_id}.md"
-        dest = target_dir / "commands" / f"{command_id}.md"
-
-        if not source.exists():
-            print(color(f"  Command not found: {command_id}", Colors.YELLOW))
+    def install(self, target_dir: Path, target_type: str, mode: str) -> InstallReport:
+        """Install the selection into a target, printing progress and results."""
+        print(color(f"\nInstalling to: {target_dir}", Colors.CYAN))
+        print("-" * 40)
+        report = self.do_install(target_dir, target_type, mode)
+        self.print_install(report)
+        return report
+
+    def print_install(self, report: InstallReport):
+        """Print the backup and per-component results of an install."""
+        unchanged = report.count('unchanged')
+        if unchanged == len(report.results):
+            print(color(f"  All {unchanged} selected components are up to date", Colors.DIM))
             return
+        if report.backup:
+            print(color(f"  Backup created: {BackupStore.backup_id(report.backup)}", Colors.BLUE))
+        for result in report.results:
+            if result.status != 'unchanged':
+                self.print_result(result)
+        if unchanged:
+            print(color(f"  {unchanged} component(s) already up to date", Colors.DIM))
+
+    def print_verify(self, target_dir: Path, results: List[VerifyResult]):
+        """Print the components of a target that drifted from their install."""
+        print(color(f"\nVerifying: {target_dir}", Colors.CYAN))
+        print("-" * 40)
 
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        if dest.exists():
-            dest.unlink()
-
-        if mode == 'symlink':
-            dest.symlink_to(source)
-        else:
-            shutil.copy2(source, dest)
-
-        print(color(f"  Installed command: {command_id}", Colors.GREEN))
+        symbols = {
+            'missing': ('!', Colors.RED),
+            'dangling': ('!', Colors.RED),
+            'modified': ('~', Colors.YELLOW),
+            'outdated': ('^', Colors.BLUE),
+        }
+        for result in results:
+            if result.ok:
+                continue
+            symbol, symbol_color = symbols[result.status]
+            print(color(f"  {symbol} {COMPONENT_LABELS[result.kind]} {result.component_id}: "
+                        f"{result.status} ({result.reason})", symbol_color))
+
+        counts = {status: sum(1 for r in results if r.status == status) for status in ['ok'] + list(symbols)}
+        print(f"\n{counts['ok']} ok, {counts['missing']} missing, {counts['dangling']} dangling, "
+              f"{counts['modified']} modified, {counts['outdated']} outdated")
+
+    def restore(self, target_dir: Path, backup_id: Optional[str] = None,
+                only: Optional[List[str]] = None) -> bool:
+        """Restore a backup, prompting for one unless backup_id is given."""
+        if not backup_id:
+            backups = self.list_backups(target_dir)
+            if not backups:
+                print(color("No backups found", Colors.YELLOW))
+                return False
 
-    def install_mcp(self, preset_id: str, target_dir: Path, target_type: str):
-        """Install an MCP preset."""
-        if target_type == 'claude-code':
-            source = self.repo_dir / "mcp" / "claude-code" / f"{preset_id}.json"
-            target = target_dir.parent / ".mcp.json"
-        else:
-            source = self.repo_dir / "mcp" / "claude-desktop" / f"{preset_id}.json"
-            target = target_dir / "claude_desktop_config.json"
+            print(color("\nAvailable backups:", Colors.BLUE))
+            for i, backup in enumerate(backups, 1):
+                print(f"  {i}. {backup.backup_id}")
+            try:
+                choice = input(f"\nSelect backup to restore (1-{len(backups)}): ").strip()
+                idx = int(choice) - 1
+            except (ValueError, KeyboardInterrupt, EOFError):
+                print(color("Restore cancelled", Colors.YELLOW))
+                return False
+            if not 0 <= idx < len(backups):
+                print(color("Invalid selection", Colors.RED))
+                return False
+            backup_id = backups[idx].backup_id
 
-        if not source.exists():
-            print(color(f"  MCP preset not found: {preset_id}", Colors.YELLOW))
+        result = self.restore_backup(target_dir, backup_id, only)
+        if result.path:
+            print(color(f"\nRestoring from: {result.path}", Colors.BLUE))
+        if not result.ok:
+            print(color(f"Restore failed: {result.error}", Colors.RED))
+            return False
+        for root in result.restored:
+            print(color(f"  Restored {root}", Colors.GREEN))
+        print(color("\nRestore complete!", Colors.GREEN + Colors.BOLD))
+        return True
+
+    def print_update(self, report: UpdateReport):
+        """Print what an update changed in each registered target."""
+        print(color(f"{len(report.changed_paths)} changed path(s) since {report.since[:12]}, "
+                    f"{len(report.affected)} component(s) affected", Colors.CYAN))
+        if not report.targets:
+            print(color("No install targets registered for this checkout.", Colors.YELLOW))
             return
-
-        target.parent.mkdir(parents=True, exist_ok=True)
-
-        # Load existing config
-        existing = {}
-        if target.exists():
-            with open(target) as f:
-                existing = json.load(f)
-
-        # Load preset
-        with open(source) as f:
-            preset = json.load(f)
-
-        # Merge mcpServers
-        existing.setdefault('mcpServers', {})
-        existing['mcpServers'].update(preset.get('mcpServers', {}))
-
-        # Write merged config
-        with open(target, 'w') as f:
-            json.dump(existing, f, indent=2)
-
-        print(color(f"  Installed MCP preset: {preset_id}", Colors.GREEN))
-
-    def do_install(self, target_dir: Path, target_type: str, mode: str):
-        """Perform the installation."""
-        print(color(f"\nInstalling to: {target_dir}", Colors.CYAN))
+        updated = {r.target_dir for r in report.reports}
+        for target_dir in report.targets:
+            if target_dir not in updated:
+                print(color(f"\n{target_dir}: up to date", Colors.DIM))
+        for install_report in report.reports:
+            print(color(f"\nInstalling to: {install_report.target_dir}", Colors.CYAN))
+            print("-" * 40)
+            self.print_install(install_report)
+
+    def print_sync(self, synced: List[SyncResult]):
+        """Print one line per file synced by --watch."""
+        for result in synced:
+            label = f"{COMPONENT_LABELS[result.kind]} {result.component_id}"
+            if result.error:
+                print(color(f"  Failed to sync {label} to {result.target_dir}: {result.error}", Colors.RED))
+            else:
+                print(f"  {datetime.now():%H:%M:%S} {label}: {result.path} -> {result.target_dir}")
+
+    def watch(self, poll: bool = False, debounce: float = 0.2):
+        """Watch the repo and sync changes into registered targets until interrupted.
+
+        Events are collected until the tree has been quiet for ``debounce``
+        seconds (at most 0.5s after the first one), then synced in one pass.
+        """
+        roots = [self.repo_dir / name for name in WATCH_DIRS]
+        watcher = open_watcher(roots, poll)
+        targets = self.registered_targets()
+        print(color(f"Watching {self.repo_dir} ({watcher.name}); "
+                    f"syncing {len(targets)} registered target(s). Press Ctrl+C to stop.", Colors.CYAN))
+
+        # Catch up on changes made while nothing was watching
+        self.print_sync(self.sync_changes())
+        try:
+            while True:
+                changed = watcher.wait()
+                first = time.monotonic()
+                while time.monotonic() - first < 0.5:
+                    more = watcher.wait(debounce)
+                    if not more:
+                        break
+                    changed |= more
+                with self.timings.span('sync'):
+                    synced = self.sync_changes(changed)
+                self.print_sync(synced)
+        except KeyboardInterrupt:
+            print(color("\nStopped watching.", Colors.DIM))
+        finally:
+            watcher.close()
+
+    def print_fleet_summary(self, results: List[ProjectResult]):
+        """Print a per-project success/failure/timing table."""
+        print(color("\nFleet Summary", Colors.BLUE + Colors.BOLD))
         print("-" * 40)
 
-        # Create backup before installing
-        self.create_backup(target_dir)
-
-        if target_type in ('claude-code', 'project'):
-            # Skills
-            for skill_id in self.selected_skills:
-                self.install_skill(skill_id, target_dir, mode)
-
-            # Agents
-            for agent_id in self.selected_agents:
-                self.install_agent(agent_id, target_dir, mode)
-
-            # Commands
-            for command_id in self.selected_commands:
-                self.install_command(command_id, target_dir, mode)
-
-            # Hooks
-            for hook_id in self.selected_hooks:
-                self.install_hook(hook_id, target_dir)
-
-            # MCP
-            for mcp_id in self.selected_mcp:
-                self.install_mcp(mcp_id, target_dir, 'claude-code')
-
-        elif target_type == 'claude-desktop':
-            # Desktop only supports MCP
-            for mcp_id in self.selected_mcp:
-                self.install_mcp(mcp_id, target_dir, 'claude-desktop')
-
-    def load_preset(self, preset_name: str):
-        """Load a preset configuration."""
-        for preset in self.catalog.get('presets', []):
-            if preset['id'] == preset_name:
-                self.selected_skills = set(preset.get('skills', []))
-                self.selected_agents = set(preset.get('agents', []))
-                self.selected_hooks = set(preset.get('hooks', []))
-                self.selected_commands = set(preset.get('commands', []))
-                self.selected_mcp = set(preset.get('mcp', []))
-                return True
-        return False
-
-    def list_components(self):
+        for result in results:
+            counts = {}
+            for r in result.results:
+                counts[r.status] = counts.get(r.status, 0) + 1
+            if result.error:
+                detail = result.error
+            else:
+                detail = ', '.join(f"{n} {status}" for status, n in sorted(counts.items())) or 'nothing selected'
+            status = color(f"{'ok':<6}", Colors.GREEN) if result.ok else color('FAILED', Colors.RED)
+            print(f"  {status} {result.seconds:7.2f}s  {result.path}  ({detail})")
+
+        failed = sum(1 for r in results if not r.ok)
+        total = sum(r.seconds for r in results)
+        print(f"\n{len(results) - failed} succeeded, {failed} failed, {total:.2f}s total install time")
+
+    def format_component(self, component: ComponentInfo) -> str:
+        """Format one catalog entry as a list line."""
+        if component.security_level:
+            level_color = Colors.GREEN if component.security_level == 'LOW' else Colors.YELLOW
+            return (f"  - {color(component.id, Colors.CYAN)} "
+                    f"[{color(component.security_level, level_color)}]: {component.description}")
+        return f"  - {color(component.id, Colors.CYAN)}: {component.description}"
+
+    def print_components(self):
         """List all available components."""
         self.print_banner()
 
-        components = self.catalog.get('components', {})
-
-        print(color("\nSkills:", Colors.BLUE + Colors.BOLD))
-        for skill in components.get('skills', []):
-            print(f"  - {color(skill['id'], Colors.CYAN)}: {skill['description']}")
-
-        print(color("\nAgents:", Colors.BLUE + Colors.BOLD))
-        for agent in components.get('agents', []):
-            print(f"  - {color(agent['id'], Colors.CYAN)}: {agent['description']}")
-
-        print(color("\nHooks:", Colors.BLUE + Colors.BOLD))
-        for hook in components.get('hooks', []):
-            level_color = Colors.GREEN if hook['securityLevel'] == 'LOW' else Colors.YELLOW
-            print(f"  - {color(hook['id'], Colors.CYAN)} [{color(hook['securityLevel'], level_color)}]: {hook['description']}")
-
-        print(color("\nCommands:", Colors.BLUE + Colors.BOLD))
-        for cmd in components.get('commands', []):
-            print(f"  - {color(cmd['id'], Colors.CYAN)}: {cmd['description']}")
-
-        print(color("\nMCP Presets (Claude Code):", Colors.BLUE + Colors.BOLD))
-        for mcp in components.get('mcp', {}).get('claude-code', []):
-            print(f"  - {color(mcp['id'], Colors.CYAN)}: {mcp['description']}")
-
-        print(color("\nMCP Presets (Claude Desktop):", Colors.BLUE + Colors.BOLD))
-        for mcp in components.get('mcp', {}).get('claude-desktop', []):
-            print(f"  - {color(mcp['id'], Colors.CYAN)}: {mcp['description']}")
+        current = None
+        for component in self.list_components():
+            if component.section != current:
+                print(color(f"\n{SECTION_TITLES[component.section]}:", Colors.BLUE + Colors.BOLD))
+                current = component.section
+            print(self.format_component(component))
 
         print(color("\nPresets:", Colors.BLUE + Colors.BOLD))
-        for preset in self.catalog.get('presets', []):
+        for preset in self.index.presets.values():
             print(f"  - {color(preset['id'], Colors.CYAN)}: {preset['description']}")
 
+    def print_search(self, query: str):
+        """List components matching a tag or text query."""
+        matches = self.search_components(query)
+        if not matches:
+            print(color(f"No components match: {query}", Colors.YELLOW))
+            return
+
+        current = None
+        for component in matches:
+            if component.section != current:
+                print(color(f"\n{SECTION_TITLES[component.section]}:", Colors.BLUE + Colors.BOLD))
+                current = component.section
+            line = self.format_component(component)
+            if component.tags:
+                line += color(f" [{', '.join(component.tags)}]", Colors.DIM)
+            print(line)
+
     def run_interactive(self):
         """Run the interactive installer."""
         # Select components
-        components = self.catalog.get('components', {})
+        sections = self.index.sections
 
         # Skills
         self.selected_skills = self.select_components(
             "Select Skills",
-            components.get('skills', []),
+            sections['skills'],
             self.selected_skills
         )
 
         # Agents
         self.selected_agents = self.select_components(
             "Select Agents",
-            components.get('agents', []),
+            sections['agents'],
             self.selected_agents
         )
 
@@ -592,12 +3074,12 @@ class Installer:
         # Commands
         self.selected_commands = self.select_components(
             "Select Commands",
-            components.get('commands', []),
+            sections['commands'],
             self.selected_commands
         )
 
         # MCP Presets
-        mcp_options = components.get('mcp', {}).get('claude-code', [])
+        mcp_options = sections['mcp/claude-code']
         self.selected_mcp = self.select_components(
             "Select MCP Presets",
             mcp_options,
@@ -633,11 +3115,11 @@ class Installer:
         if target_type == 'both':
             code_target, desktop_target = target_path
             if code_target:
-                self.do_install(code_target, 'claude-code', mode)
+                self.install(code_target, 'claude-code', mode)
             if desktop_target:
-                self.do_install(desktop_target, 'claude-desktop', mode)
+                self.install(desktop_target, 'claude-desktop', mode)
         else:
-            self.do_install(target_path, target_type, mode)
+            self.install(target_path, target_type, mode)
 
         print(color("\nInstallation complete!", Colors.GREEN + Colors.BOLD))
 
@@ -650,55 +3132,166 @@ class Installer:
 def main():
     parser = argparse.ArgumentParser(description='Claude Code Community Extensions Installer')
     parser.add_argument('--list', action='store_true', help='List all components')
+    parser.add_argument('--search', type=str, metavar='TAG/TEXT',
+                        help='List components with a tag or matching text')
     parser.add_argument('--preset', type=str, help='Install a preset')
     parser.add_argument('--target', choices=['claude-code', 'claude-desktop', 'both', 'project'],
                         default='claude-code', help='Installation target')
-    parser.add_argument('--mode', choices=['symlink', 'copy'], default='symlink',
+    parser.add_argument('--mode', choices=INSTALL_MODES, default='symlink',
                         help='Installation mode')
-    parser.add_argument('--restore', action='store_true', help='Restore from a previous backup')
+    parser.add_argument('--restore', nargs='?', const='', metavar='BACKUP_ID',
+                        help='Restore from a previous backup; give a backup id (or "latest") '
+                             'to restore without prompting')
+    parser.add_argument('--list-backups', action='store_true', dest='list_backups',
+                        help='List backup ids for the target')
     parser.add_argument('--no-backup', action='store_true', dest='no_backup',
                         help='Skip backing up existing configuration')
+    parser.add_argument('--backup-format', choices=['store', 'archive'], default='store',
+                        help='Back up into the deduplicating store (default) or one .tar.gz archive')
+    parser.add_argument('--restore-only', action='append', metavar='PATH',
+                        help='With --restore, restore only this backed-up path '
+                             '(e.g. skills/git-workflow or settings.json); repeatable')
+    parser.add_argument('--plan', action='store_true',
+                        help='Show what would be installed or updated, without changing anything')
+    parser.add_argument('--force', action='store_true',
+                        help='Reinstall components even if they are up to date')
+    parser.add_argument('--watch', action='store_true',
+                        help='Watch the repo and sync changes into copy-mode targets until interrupted')
+    parser.add_argument('--poll', action='store_true',
+                        help='With --watch, poll for changes instead of using inotify')
+    parser.add_argument('--update-from', type=str, metavar='REV', dest='update_from',
+                        help='Reinstall components changed between REV and HEAD in every registered target')
+    parser.add_argument('--verify', action='store_true',
+                        help='Report missing, dangling, modified and outdated components in the target')
+    parser.add_argument('--repair', action='store_true',
+                        help='Like --verify, then reinstall only the components that drifted')
+    parser.add_argument('--fleet', type=Path, metavar='LOCKFILE',
+                        help='Install into every project listed in a JSON lockfile')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print a per-phase and per-component timing summary')
+    parser.add_argument('--trace', type=Path, metavar='FILE',
+                        help='Write timing spans as a Chrome trace JSON file (implies --timings)')
+    parser.add_argument('--plain', action='store_true',
+                        help='Use numbered line menus instead of the full-screen selector')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, metavar='N',
+                        help=f'Parallel install workers (default: {DEFAULT_JOBS}, 1 = serial)')
 
     args = parser.parse_args()
 
-    installer = Installer()
+    timings = Timings(enabled=args.timings or args.trace is not None)
+    installer = InstallerTUI(timings=timings)
     installer.no_backup = args.no_backup
-
+    installer.backup_format = args.backup_format
+    installer.jobs = max(1, args.jobs)
+    installer.force = args.force
+    if args.plain:
+        installer.use_curses = False
+
+    try:
+        run_cli(installer, args)
+    finally:
+        if timings.enabled:
+            timings.print_summary()
+        if args.trace is not None:
+            timings.write_trace(args.trace)
+            print(f"Trace written to: {args.trace}")
+
+
+def single_target_path(installer: Installer, target: str) -> Optional[Path]:
+    """Return the directory of a single --target ('both' means global)."""
+    if target == 'claude-desktop':
+        return installer.get_claude_desktop_path()
+    if target == 'project':
+        return Path.cwd() / '.claude'
+    return installer.claude_code_global
+
+
+def run_cli(installer: InstallerTUI, args: argparse.Namespace):
+    """Dispatch the parsed command line to the installer."""
     if args.list:
-        installer.list_components()
+        installer.print_components()
         return
 
-    if args.restore:
-        installer.print_banner()
-        print(color("Restore Mode", Colors.CYAN + Colors.BOLD))
-        print()
+    if args.search:
+        installer.print_search(args.search)
+        return
 
-        # Determine target directory for restore
-        if args.target == 'claude-code':
-            target_path = installer.claude_code_global
-        elif args.target == 'claude-desktop':
-            target_path = installer.get_claude_desktop_path()
-        elif args.target == 'project':
-            target_path = Path.cwd() / '.claude'
+    if args.fleet:
+        start = time.perf_counter()
+        results = installer.run_fleet(args.fleet)
+        installer.print_fleet_summary(results)
+        print(f"Wall time: {time.perf_counter() - start:.2f}s")
+        if not all(r.ok for r in results):
+            sys.exit(1)
+        return
+
+    if args.watch:
+        installer.watch(poll=args.poll)
+        return
+
+    if args.update_from:
+        try:
+            report = installer.update_from(args.update_from)
+        except subprocess.CalledProcessError as e:
+            print(color(f"Error: git diff failed: {e.stderr.strip()}", Colors.RED))
+            sys.exit(1)
+        installer.print_update(report)
+        if not report.ok:
+            sys.exit(1)
+        return
+
+    if args.verify or args.repair:
+        if args.target == 'both':
+            targets = [installer.claude_code_global, installer.get_claude_desktop_path()]
         else:
-            target_path = installer.claude_code_global
+            targets = [single_target_path(installer, args.target)]
+
+        drifted = False
+        for target_path in filter(None, targets):
+            results = installer.verify_install(target_path)
+            if results is None:
+                print(color(f"\nNo install state in {target_path}; nothing to verify", Colors.YELLOW))
+                continue
+            installer.print_verify(target_path, results)
+            if args.repair and not all(r.ok for r in results):
+                print(color(f"\nRepairing: {target_path}", Colors.CYAN))
+                print("-" * 40)
+                for report in installer.repair_install(target_path, results):
+                    installer.print_install(report)
+                    drifted |= not report.ok
+            else:
+                drifted |= not all(r.ok for r in results)
+        if drifted:
+            sys.exit(1)
+        return
 
+    if args.restore is not None or args.list_backups:
+        target_path = single_target_path(installer, args.target)
         if target_path is None:
             print(color("Error: Claude Desktop not supported on this platform", Colors.RED))
             return
 
-        if installer.restore_backup(target_path):
-            print(color("\nRestore complete!", Colors.GREEN + Colors.BOLD))
-        else:
+        if args.list_backups:
+            for backup in installer.list_backups(target_path):
+                print(backup.backup_id)
+            return
+
+        if not args.restore:
+            installer.print_banner()
+            print(color("Restore Mode", Colors.CYAN + Colors.BOLD))
+            print()
+
+        if not installer.restore(target_path, args.restore or None, args.restore_only):
             print(color("\nRestore cancelled or failed.", Colors.YELLOW))
+            sys.exit(1)
         return
 
     if args.preset:
         if not installer.load_preset(args.preset):
             print(color(f"Preset not found: {args.preset}", Colors.RED))
             print("Available presets:")
-            for preset in installer.catalog.get('presets', []):
-                print(f"  - {preset['id']}")
+            for preset_id in installer.index.presets:
+                print(f"  - {preset_id}")
             return
 
         # Determine target
@@ -712,16 +3305,27 @@ def main():
             target_path = Path.cwd() / '.claude'
 
         installer.print_banner()
+
+        if args.plan:
+            print(f"Planning preset: {args.preset}")
+            if args.target == 'both':
+                targets = [(t, kind) for t, kind in zip(target_path, ('claude-code', 'claude-desktop')) if t]
+            else:
+                targets = [(target_path, args.target)]
+            for plan_target, plan_type in targets:
+                installer.print_plan(plan_target, installer.plan_install(plan_target, plan_type, args.mode))
+            return
+
         print(f"Installing preset: {args.preset}")
 
         if args.target == 'both':
             code_target, desktop_target = target_path
             if code_target:
-                installer.do_install(code_target, 'claude-code', args.mode)
+                installer.install(code_target, 'claude-code', args.mode)
             if desktop_target:
-                installer.do_install(desktop_target, 'claude-desktop', args.mode)
+                installer.install(desktop_target, 'claude-desktop', args.mode)
         else:
-            installer.do_install(target_path, args.target, args.mode)
+            installer.install(target_path, args.target, args.mode)
 
         print(color("\nInstallation complete!", Colors.GREEN + Colors.BOLD))
         return
@@ -20,6 +20,9 @@ if [[ -n $(git status --porcelain) ]]; then
     STASHED=true
 fi
 
+# Remember where we were, so only what changed gets reinstalled
+OLD_HEAD=$(git rev-parse HEAD)
+
 # Pull latest
 echo "Pulling latest changes..."
 git pull origin main
@@ -30,8 +33,18 @@ if [[ "$STASHED" == true ]]; then
     git stash pop
 fi
 
+echo ""
+if [[ "$(git rev-parse HEAD)" == "$OLD_HEAD" ]]; then
+    echo "Already up to date."
+    exit 0
+fi
+
+# Reinstall or re-merge changed components in every target installed with install.py
+echo "Updating installed components..."
+python3 "$SCRIPT_DIR/install.py" --update-from "$OLD_HEAD"
+
 echo ""
 echo "Update complete!"
 echo ""
-echo "If you installed with copy mode, run:"
+echo "Targets installed with ./install.sh are not tracked. If you used copy mode there, run:"
 echo "  ./install.sh --global --mode copy --force"
@@ -5,21 +5,40 @@ Validate Claude Code Community Extension components.
 Usage:
     ./scripts/validate.py                     # Validate all components
     ./scripts/validate.py skills/git-workflow # Validate specific component
-    ./scripts/validate.py --changed-only      # Validate only changed files (for CI)
+    ./scripts/validate.py --changed-only      # Validate only components affected by the last commit
+    ./scripts/validate.py --changed-only --base origin/main  # ... or by a whole branch (for CI)
+    ./scripts/validate.py --jobs 0            # Validate in parallel, one process per CPU
+    ./scripts/validate.py --references        # Check only catalog and preset references
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-try:
-    import yaml
-except ImportError:
-    print("Warning: PyYAML not installed. Install with: pip install pyyaml")
-    yaml = None
+# PyYAML is imported on first use: most frontmatter never needs it
+_yaml = None
+_yaml_loader = None
+_yaml_found: Optional[bool] = None
+
+# Scalars PyYAML would not load as strings (booleans, nulls); anything that
+# starts like a number, date or special float is left to YAML as well
+YAML_NON_STRINGS = {"y", "n", "yes", "no", "true", "false", "on", "off", "null", "~"}
+YAML_NON_STRING_START = set("0123456789+-.~=<")
+YAML_INDICATORS = set("-?:,[]{}#&*!|>'\"%@`")
+FRONTMATTER_KEY = re.compile(r"[A-Za-z][A-Za-z0-9_-]*\Z")
+
+
+# Validation results of unchanged components, relative to the repo root
+CACHE_PATH = Path(".cache") / "validation.json"
 
 
 class ValidationError:
@@ -32,28 +51,106 @@ class ValidationError:
         return f"[{self.severity.upper()}] {self.path}: {self.message}"
 
 
+def load_yaml(text: str):
+    """Load YAML with PyYAML, importing it (and its C loader if built) on first use."""
+    global _yaml, _yaml_loader
+    if _yaml is None:
+        import yaml
+        _yaml = yaml
+        _yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return _yaml.load(text, Loader=_yaml_loader)
+
+
+def yaml_available() -> bool:
+    """Whether PyYAML can be imported, warning once if it cannot."""
+    global _yaml_found
+    if _yaml_found is None:
+        import importlib.util
+        _yaml_found = _yaml is not None or importlib.util.find_spec("yaml") is not None
+        if not _yaml_found:
+            print("Warning: PyYAML not installed. Install with: pip install pyyaml")
+    return _yaml_found
+
+
+def parse_flat_header(text: str) -> Optional[dict]:
+    """Parse a header of plain one-line "key: value" pairs without YAML.
+
+    Returns None for anything outside that subset (quoting, lists, block
+    scalars, comments after values, values YAML would read as numbers,
+    booleans, dates or nulls), so that the caller can fall back to YAML.
+    Whenever it returns a dict, the dict equals what yaml.safe_load returns.
+    """
+    metadata = {}
+    for line in text.split("\n"):
+        line = line.rstrip("\r")
+        stripped = line.strip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t":
+            return None
+        key, sep, value = line.partition(": ")
+        if not sep:
+            if not line.endswith(":"):
+                return None
+            key, value = line[:-1], ""
+        value = value.strip(" \t")
+        if not FRONTMATTER_KEY.match(key) or key.lower() in YAML_NON_STRINGS:
+            return None
+        if not value:
+            return None
+        if (value[0] in YAML_INDICATORS or value[0] in YAML_NON_STRING_START
+                or value.lower() in YAML_NON_STRINGS or value.endswith(":")
+                or ": " in value or " #" in value or "\t#" in value
+                or not value.replace("\t", " ").isprintable()):
+            return None
+        metadata[key] = value
+    return metadata or None
+
+
+def parse_header(text: str) -> Optional[dict]:
+    """Parse frontmatter text: the flat fast path, else YAML."""
+    metadata = parse_flat_header(text)
+    if metadata is not None:
+        return metadata
+    if not yaml_available():
+        # Basic parsing without yaml
+        metadata = {}
+        for line in text.strip().split("\n"):
+            if ":" in line:
+                key, value = line.split(":", 1)
+                metadata[key.strip()] = value.strip()
+        return metadata
+    return load_yaml(text)
+
+
 def parse_frontmatter(content: str) -> Tuple[Optional[dict], str]:
     """Parse YAML frontmatter from markdown content."""
-    if not content.startswith("---"):
+    match = re.match(r"---[ \t]*\r?\n(.*?)^---[ \t]*\r?$", content, re.DOTALL | re.MULTILINE)
+    if not match:
         return None, content
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    try:
+        return parse_header(match.group(1)), content[match.end():]
+    except Exception:
         return None, content
 
-    try:
-        if yaml:
-            metadata = yaml.safe_load(parts[1])
+
+def read_frontmatter(path: Path) -> Optional[dict]:
+    """Read a file's frontmatter, stopping at the closing --- line."""
+    with open(path, encoding="utf-8") as f:
+        if f.readline().rstrip("\r\n").rstrip(" \t") != "---":
+            return None
+        lines = []
+        for line in f:
+            if line.rstrip("\r\n").rstrip(" \t") == "---":
+                break
+            lines.append(line)
         else:
-            # Basic parsing without yaml
-            metadata = {}
-            for line in parts[1].strip().split("\n"):
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    metadata[key.strip()] = value.strip()
-        return metadata, parts[2]
+            return None
+    try:
+        return parse_header("".join(lines))
     except Exception:
-        return None, content
+        return None
 
 
 def validate_skill(skill_path: Path) -> List[ValidationError]:
@@ -148,6 +245,310 @@ def validate_agent(agent_path: Path) -> List[ValidationError]:
     return errors
 
 
+# JSON schemas, in a small subset of JSON Schema: type, enum, pattern,
+# minLength, required, properties, additionalProperties, propertyNames, items
+# and minItems, plus anyRequired (at least one of the keys) and requiredWhen
+# ({key: {value: [keys required when key has that value]}}). "severity"
+# downgrades errors reported at that node to warnings.
+
+JSON_TYPES = {"object": dict, "array": list, "string": str, "integer": int, "number": (int, float), "boolean": bool}
+
+HOOK_EVENTS = ["PreToolUse", "PostToolUse", "Notification", "UserPromptSubmit", "Stop", "SubagentStop",
+               "PreCompact", "SessionStart", "SessionEnd"]
+
+HOOK_HANDLER_SCHEMA = {
+    "type": "object",
+    "required": ["type"],
+    "properties": {
+        "type": {"type": "string", "enum": ["command", "prompt"]},
+        "command": {"type": "string", "minLength": 1},
+        "prompt": {"type": "string", "minLength": 1},
+        "timeout": {"type": "number"},
+    },
+    "requiredWhen": {"type": {"command": ["command"], "prompt": ["prompt"]}},
+}
+
+HOOK_SETTINGS_SCHEMA = {
+    "type": "object",
+    "required": ["hooks"],
+    "properties": {
+        "hooks": {
+            "type": "object",
+            "propertyNames": {"enum": HOOK_EVENTS, "severity": "warning"},
+            "additionalProperties": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["hooks"],
+                    "properties": {
+                        "matcher": {"type": "string"},
+                        "hooks": {"type": "array", "minItems": 1, "items": HOOK_HANDLER_SCHEMA},
+                    },
+                },
+            },
+        },
+    },
+}
+
+MCP_SERVER_SCHEMA = {
+    "type": "object",
+    "anyRequired": ["url", "command"],
+    "properties": {
+        "command": {"type": "string", "minLength": 1},
+        "args": {"type": "array", "items": {"type": "string"}},
+        "env": {"type": "object", "additionalProperties": {"type": "string"}},
+        "url": {"type": "string", "minLength": 1},
+        "headers": {"type": "object", "additionalProperties": {"type": "string"}},
+        "transport": {"type": "string", "enum": ["stdio", "http", "sse"]},
+        "type": {"type": "string", "enum": ["stdio", "http", "sse"]},
+    },
+    "requiredWhen": {
+        "transport": {"http": ["url"], "sse": ["url"], "stdio": ["command"]},
+        "type": {"http": ["url"], "sse": ["url"], "stdio": ["command"]},
+    },
+}
+
+MCP_PRESET_SCHEMA = {
+    "type": "object",
+    "required": ["mcpServers"],
+    "properties": {
+        "mcpServers": {"type": "object", "additionalProperties": MCP_SERVER_SCHEMA},
+    },
+}
+
+COMPONENT_ID_SCHEMA = {"type": "string", "pattern": r"^[a-z0-9-]+$"}
+STRING_LIST_SCHEMA = {"type": "array", "items": {"type": "string"}}
+
+
+def catalog_entry_schema(**properties) -> Dict:
+    """Schema of a catalog component entry, with section-specific properties."""
+    return {
+        "type": "object",
+        "required": ["id", "name", "description", "path"],
+        "properties": {
+            "id": COMPONENT_ID_SCHEMA,
+            "name": {"type": "string", "minLength": 1},
+            "description": {"type": "string"},
+            "path": {"type": "string", "minLength": 1},
+            "tags": STRING_LIST_SCHEMA,
+            "version": {"type": "string"},
+            **properties,
+        },
+    }
+
+
+PRESET_MEMBERS_PROPERTIES = {
+    section: {"type": "array", "items": COMPONENT_ID_SCHEMA}
+    for section in ["skills", "agents", "hooks", "commands", "mcp"]
+}
+
+CATALOG_SCHEMA = {
+    "type": "object",
+    "required": ["components", "presets"],
+    "properties": {
+        "version": {"type": "string"},
+        "lastUpdated": {"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}$"},
+        "components": {
+            "type": "object",
+            "properties": {
+                "skills": {"type": "array", "items": catalog_entry_schema()},
+                "agents": {"type": "array", "items": catalog_entry_schema(
+                    model={"type": "string", "enum": ["haiku", "sonnet", "opus", "inherit"]})},
+                "hooks": {"type": "array", "items": catalog_entry_schema(
+                    securityLevel={"type": "string", "enum": ["LOW", "MEDIUM", "HIGH"]},
+                    commands=STRING_LIST_SCHEMA)},
+                "commands": {"type": "array", "items": catalog_entry_schema()},
+                "mcp": {
+                    "type": "object",
+                    "properties": {
+                        platform: {"type": "array", "items": catalog_entry_schema(servers=STRING_LIST_SCHEMA)}
+                        for platform in ["claude-code", "claude-desktop"]
+                    },
+                },
+            },
+        },
+        "presets": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "name"],
+                "properties": {
+                    "id": COMPONENT_ID_SCHEMA,
+                    "name": {"type": "string", "minLength": 1},
+                    "description": {"type": "string"},
+                    **PRESET_MEMBERS_PROPERTIES,
+                },
+            },
+        },
+    },
+}
+
+MANIFEST_SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": COMPONENT_ID_SCHEMA,
+        "description": {"type": "string"},
+        **PRESET_MEMBERS_PROPERTIES,
+    },
+}
+
+# A schema error: (path, message, severity). Paths are (parent, key) chains,
+# only formatted when an error is reported.
+SchemaError = Tuple[Optional[tuple], str, str]
+
+
+def json_path(path: Optional[tuple]) -> str:
+    """Format a (parent, key) chain as a JSON path such as $.hooks.Stop[0]."""
+    keys = []
+    while path is not None:
+        path, key = path
+        keys.append(key)
+    formatted = "$"
+    for key in reversed(keys):
+        if isinstance(key, int):
+            formatted += f"[{key}]"
+        elif re.match(r"^[A-Za-z_][A-Za-z0-9_-]*$", key):
+            formatted += f".{key}"
+        else:
+            formatted += f"[{json.dumps(key)}]"
+    return formatted
+
+
+def type_name(value) -> str:
+    for name, types in JSON_TYPES.items():
+        if isinstance(value, types) and not (isinstance(value, bool) and name != "boolean"):
+            return name
+    return "null" if value is None else type(value).__name__
+
+
+def compile_schema(schema: Dict) -> Callable[[object, Optional[tuple], List[SchemaError]], None]:
+    """Compile a schema into a function check(value, path, errors).
+
+    Each keyword becomes a closure, nested schemas are compiled once up front,
+    and checks that do not apply to a value's type are never run.
+    """
+    severity = schema.get("severity", "error")
+    checks: List[Callable[[object, Optional[tuple], List[SchemaError]], None]] = []
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+        allowed_set = set(allowed)
+
+        def check_enum(value, path, errors):
+            if value not in allowed_set:
+                errors.append((path, f"must be one of {allowed}, got {value!r}", severity))
+        checks.append(check_enum)
+
+    if "pattern" in schema or "minLength" in schema:
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        min_length = schema.get("minLength", 0)
+
+        def check_string(value, path, errors):
+            if not isinstance(value, str):
+                return
+            if len(value) < min_length:
+                errors.append((path, "must not be empty" if min_length == 1 else
+                               f"must be at least {min_length} characters", severity))
+            elif pattern is not None and not pattern.search(value):
+                errors.append((path, f"must match {pattern.pattern}, got {value!r}", severity))
+        checks.append(check_string)
+
+    if any(key in schema for key in ("required", "anyRequired", "requiredWhen")):
+        required = schema.get("required", [])
+        any_required = schema.get("anyRequired", [])
+        required_when = schema.get("requiredWhen", {})
+
+        def check_required(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    errors.append((path, f"missing required key '{key}'", severity))
+            conditional = False
+            for key, cases in required_when.items():
+                selector = value.get(key)
+                if isinstance(selector, str) and selector in cases:
+                    conditional = True
+                    for needed in cases[selector]:
+                        if needed not in value:
+                            errors.append((path, f"missing '{needed}', required when {key} is '{selector}'", severity))
+            # A more specific requiredWhen case replaces the generic message
+            if any_required and not conditional and not any(key in value for key in any_required):
+                errors.append((path, "must have " + " or ".join(f"'{key}'" for key in any_required), severity))
+        checks.append(check_required)
+
+    if any(key in schema for key in ("properties", "additionalProperties", "propertyNames")):
+        properties = {key: compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        check_additional = compile_schema(additional) if isinstance(additional, dict) else None
+        check_name = compile_schema(schema["propertyNames"]) if "propertyNames" in schema else None
+
+        def check_properties(value, path, errors):
+            if not isinstance(value, dict):
+                return
+            for key, item in value.items():
+                item_path = (path, key)
+                if check_name is not None:
+                    check_name(key, item_path, errors)
+                check = properties.get(key)
+                if check is not None:
+                    check(item, item_path, errors)
+                elif check_additional is not None:
+                    check_additional(item, item_path, errors)
+                elif additional is False:
+                    errors.append((item_path, "unexpected key", severity))
+        checks.append(check_properties)
+
+    if "items" in schema or "minItems" in schema:
+        check_item = compile_schema(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+
+        def check_items(value, path, errors):
+            if not isinstance(value, list):
+                return
+            if len(value) < min_items:
+                errors.append((path, f"must have at least {min_items} item(s)", severity))
+            if check_item is not None:
+                for index, item in enumerate(value):
+                    check_item(item, (path, index), errors)
+        checks.append(check_items)
+
+    expected = schema.get("type")
+    if expected is None:
+        def check(value, path, errors):
+            for run in checks:
+                run(value, path, errors)
+        return check
+
+    types = JSON_TYPES[expected]
+    numeric = expected in ("integer", "number")
+    message = f"must be {'an' if expected[0] in 'aeiou' else 'a'} {expected}, got "
+
+    def check_typed(value, path, errors):
+        # bool is an int subclass, but not a JSON number
+        if not isinstance(value, types) or (numeric and isinstance(value, bool)):
+            errors.append((path, message + type_name(value), severity))
+            return
+        for run in checks:
+            run(value, path, errors)
+    return check_typed
+
+
+def schema_errors(check: Callable, value, file_path: Path) -> List[ValidationError]:
+    """Run a compiled schema and report its errors against file_path."""
+    errors: List[SchemaError] = []
+    check(value, None, errors)
+    return [ValidationError(str(file_path), f"{json_path(path)}: {message}", severity)
+            for path, message, severity in errors]
+
+
+check_hook_settings = compile_schema(HOOK_SETTINGS_SCHEMA)
+check_mcp_preset = compile_schema(MCP_PRESET_SCHEMA)
+check_catalog = compile_schema(CATALOG_SCHEMA)
+check_manifest = compile_schema(MANIFEST_SCHEMA)
+
+
 def validate_hook(hook_path: Path) -> List[ValidationError]:
     """Validate a hook directory."""
     errors = []
@@ -171,8 +572,7 @@ def validate_hook(hook_path: Path) -> List[ValidationError]:
             with open(settings) as f:
                 config = json.load(f)
 
-            if "hooks" not in config:
-                errors.append(ValidationError(str(settings), "settings.json must contain 'hooks' key"))
+            errors.extend(schema_errors(check_hook_settings, config, settings))
 
         except json.JSONDecodeError as e:
             errors.append(ValidationError(str(settings), f"Invalid JSON: {e}"))
@@ -208,18 +608,7 @@ def validate_mcp_preset(preset_path: Path) -> List[ValidationError]:
         with open(preset_path) as f:
             config = json.load(f)
 
-        if "mcpServers" not in config:
-            errors.append(ValidationError(str(preset_path), "MCP preset must contain 'mcpServers' key"))
-        else:
-            for server_name, server_config in config["mcpServers"].items():
-                # Check for required fields based on transport type
-                if "transport" in server_config:
-                    if server_config["transport"] == "http" and "url" not in server_config:
-                        errors.append(ValidationError(str(preset_path), f"Server '{server_name}' with http transport must have 'url'"))
-                    elif server_config["transport"] == "stdio" and "command" not in server_config:
-                        errors.append(ValidationError(str(preset_path), f"Server '{server_name}' with stdio transport must have 'command'"))
-                elif "command" not in server_config and "url" not in server_config:
-                    errors.append(ValidationError(str(preset_path), f"Server '{server_name}' must have either 'url' or 'command'"))
+        errors.extend(schema_errors(check_mcp_preset, config, preset_path))
 
     except json.JSONDecodeError as e:
         errors.append(ValidationError(str(preset_path), f"Invalid JSON: {e}"))
@@ -227,59 +616,356 @@ def validate_mcp_preset(preset_path: Path) -> List[ValidationError]:
     return errors
 
 
-def validate_all(repo_root: Path) -> List[ValidationError]:
-    """Validate all components in the repository."""
-    errors = []
+def discover_components(repo_root: Path) -> List[Tuple[Callable[[Path], List[ValidationError]], Path]]:
+    """Return (validator, path) for every component, in a stable order."""
+    tasks = []
 
-    # Validate skills
+    # Skills
     skills_dir = repo_root / "skills"
     if skills_dir.exists():
-        for skill in skills_dir.iterdir():
+        for skill in sorted(skills_dir.iterdir()):
             if skill.is_dir() and not skill.name.startswith("."):
-                errors.extend(validate_skill(skill))
+                tasks.append((validate_skill, skill))
 
-    # Validate agents
+    # Agents
     agents_dir = repo_root / "agents"
     if agents_dir.exists():
-        for agent in agents_dir.glob("*.md"):
+        for agent in sorted(agents_dir.glob("*.md")):
             if agent.name != "README.md":
-                errors.extend(validate_agent(agent))
+                tasks.append((validate_agent, agent))
 
-    # Validate hooks
+    # Hooks
     hooks_dir = repo_root / "hooks"
     if hooks_dir.exists():
-        for hook in hooks_dir.iterdir():
+        for hook in sorted(hooks_dir.iterdir()):
             if hook.is_dir() and not hook.name.startswith("."):
-                errors.extend(validate_hook(hook))
+                tasks.append((validate_hook, hook))
 
-    # Validate commands
+    # Commands
     commands_dir = repo_root / "commands"
     if commands_dir.exists():
-        for command in commands_dir.glob("*.md"):
+        for command in sorted(commands_dir.glob("*.md")):
             if command.name != "README.md":
-                errors.extend(validate_command(command))
+                tasks.append((validate_command, command))
 
-    # Validate MCP presets
+    # MCP presets
     for mcp_dir in [repo_root / "mcp" / "claude-code", repo_root / "mcp" / "claude-desktop"]:
         if mcp_dir.exists():
-            for preset in mcp_dir.glob("*.json"):
-                errors.extend(validate_mcp_preset(preset))
+            for preset in sorted(mcp_dir.glob("*.json")):
+                tasks.append((validate_mcp_preset, preset))
+
+    return tasks
+
+
+def run_task(task: Tuple[Callable[[Path], List[ValidationError]], Path]) -> List[ValidationError]:
+    """Run one validator; module-level so process pool workers can unpickle it."""
+    validator, path = task
+    return validator(path)
+
+
+class ValidationCache:
+    """Validation results of unchanged components, persisted between runs.
+
+    Entries are keyed by validator and component path and hold the component's
+    file stats, a digest of its contents and the errors found. A component
+    whose files all have the recorded (size, mtime, inode) is reused without
+    being read; one whose stats changed is hashed and reused if the contents
+    did not. The whole cache is dropped when validate.py changes.
+    """
+
+    # Files modified this close to a run may change again within the same
+    # mtime tick, so their stats are not trusted on the next run
+    RACY_NS = 2_000_000_000
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.version = self.validator_version()
+        self.started = time.time_ns()
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") == self.version:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def validator_version() -> str:
+        """Digest of this script, plus whether PyYAML parsed the frontmatter."""
+        digest = hashlib.sha256(Path(__file__).read_bytes())
+        digest.update(b"yaml" if yaml_available() else b"no-yaml")
+        return digest.hexdigest()
+
+    @staticmethod
+    def scan(path: Path) -> Dict[str, List[int]]:
+        """lstat a component's files, keyed by path relative to the component."""
+        if not path.is_dir():
+            st = path.lstat()
+            return {path.name: [st.st_size, st.st_mtime_ns, st.st_ino]}
+        stats = {}
+        stack = [(path, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((Path(entry.path), rel + "/"))
+                    else:
+                        st = entry.stat(follow_symlinks=False)
+                        stats[rel] = [st.st_size, st.st_mtime_ns, st.st_ino]
+        return stats
+
+    @staticmethod
+    def digest(path: Path, stats: Dict[str, List[int]]) -> str:
+        """Combined SHA-256 of a component's file names and contents."""
+        combined = hashlib.sha256()
+        for rel in sorted(stats):
+            file_path = path / rel if path.is_dir() else path
+            if file_path.is_symlink():
+                content = f"symlink:{os.readlink(file_path)}".encode()
+            else:
+                content = file_path.read_bytes()
+            combined.update(f"{rel}\0{hashlib.sha256(content).hexdigest()}\n".encode())
+        return combined.hexdigest()
+
+    @staticmethod
+    def key(validator: Callable, path: Path) -> str:
+        return f"{validator.__name__}:{path}"
+
+    def lookup(self, validator: Callable, path: Path) -> Tuple[Optional[List[ValidationError]], Dict]:
+        """Return cached errors (or None) and the state to store on a miss."""
+        try:
+            stats = self.scan(path)
+        except OSError:
+            return None, {}
+        entry = self.entries.get(self.key(validator, path))
+        state = {"stats": stats}
+        if entry and entry["stats"] == stats:
+            return [ValidationError(*error) for error in entry["errors"]], state
+
+        try:
+            state["digest"] = self.digest(path, stats)
+        except OSError:
+            return None, {}
+        if entry and entry["digest"] == state["digest"]:
+            # Touched but unchanged: reuse, and remember the new stats
+            errors = [ValidationError(*error) for error in entry["errors"]]
+            self.store(validator, path, state, errors)
+            return errors, state
+        return None, state
+
+    def store(self, validator: Callable, path: Path, state: Dict, errors: List[ValidationError]):
+        if "digest" not in state:
+            return
+        stats = {
+            rel: (stat if stat[1] < self.started - self.RACY_NS else None)
+            for rel, stat in state["stats"].items()
+        }
+        self.entries[self.key(validator, path)] = {
+            "stats": stats,
+            "digest": state["digest"],
+            "errors": [[error.path, error.message, error.severity] for error in errors],
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the cache if anything changed; a failed write is not an error."""
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.tmp-{os.getpid()}")
+            with open(tmp, "w") as f:
+                json.dump({"version": self.version, "entries": self.entries}, f)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+def run_tasks(tasks: List[Tuple[Callable[[Path], List[ValidationError]], Path]], jobs: int = 1,
+              cache: Optional[ValidationCache] = None) -> List[ValidationError]:
+    """Run validators, across a process pool when jobs > 1.
+
+    Results are concatenated in task order whatever order workers finish in,
+    so output is identical to a sequential run. With a cache, only components
+    that changed since they were last validated are run.
+    """
+    results: List[Optional[List[ValidationError]]] = [None] * len(tasks)
+    states: Dict[int, Dict] = {}
+    if cache is not None:
+        for i, (validator, path) in enumerate(tasks):
+            results[i], states[i] = cache.lookup(validator, path)
+    pending = [i for i, result in enumerate(results) if result is None]
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(pending))
+
+    fresh = None
+    if jobs > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                # Batch small components so IPC does not dominate
+                chunksize = max(1, len(pending) // (jobs * 4))
+                fresh = list(executor.map(run_task, [tasks[i] for i in pending], chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # No working multiprocessing here (e.g. no /dev/shm): run in-process
+            fresh = None
+    if fresh is None:
+        fresh = [run_task(tasks[i]) for i in pending]
+
+    for i, errors in zip(pending, fresh):
+        results[i] = errors
+        if cache is not None:
+            validator, path = tasks[i]
+            cache.store(validator, path, states[i], errors)
+    if cache is not None:
+        cache.save()
+
+    return [error for errors in results for error in errors]
+
+
+def validate_all(repo_root: Path, jobs: int = 1, cache: Optional[ValidationCache] = None) -> List[ValidationError]:
+    """Validate all components in the repository, then their cross-references.
+
+    jobs is the number of worker processes; 0 uses one per CPU.
+    """
+    return run_tasks(discover_components(repo_root), jobs, cache) + validate_references(repo_root)
+
+
+def validate_references(repo_root: Path) -> List[ValidationError]:
+    """Check that catalog.json, preset manifests and the component tree agree.
+
+    Loads the catalog and every presets/*/manifest.json once, builds id sets
+    per component type and reports, in one pass over the references:
+    catalog entries whose path does not exist or whose id is duplicated,
+    components missing from the catalog, preset members that are not in the
+    catalog, and presets that differ between the catalog and their manifest.
+    """
+    errors = []
+    catalog_path = repo_root / "catalog.json"
+    try:
+        catalog = json.loads(catalog_path.read_text())
+    except OSError:
+        return [ValidationError(str(catalog_path), "Missing catalog.json")]
+    except json.JSONDecodeError as e:
+        return [ValidationError(str(catalog_path), f"Invalid JSON: {e}")]
+    errors.extend(schema_errors(check_catalog, catalog, catalog_path))
+    if not isinstance(catalog, dict):
+        return errors
+
+    # Ids on disk and in the catalog; MCP presets are per platform
+    sections = ["skills", "agents", "hooks", "commands", "mcp/claude-code", "mcp/claude-desktop"]
+    validator_sections = {validate_skill: "skills", validate_agent: "agents", validate_hook: "hooks",
+                          validate_command: "commands"}
+    on_disk: Dict[str, Set[str]] = {section: set() for section in sections}
+    for validator, path in discover_components(repo_root):
+        section = validator_sections.get(validator, f"mcp/{path.parent.name}")
+        on_disk[section].add(path.name if path.is_dir() else path.stem)
+
+    # Malformed structure is reported by the schema; skip what cannot be read
+    def as_dict(value) -> Dict:
+        return value if isinstance(value, dict) else {}
+
+    def as_list(value) -> List:
+        return value if isinstance(value, list) else []
+
+    components = as_dict(catalog.get("components"))
+    in_catalog: Dict[str, Set[str]] = {section: set() for section in sections}
+    for section in sections:
+        if section.startswith("mcp/"):
+            entries = as_list(as_dict(components.get("mcp")).get(section[4:]))
+        else:
+            entries = as_list(components.get(section))
+        for entry in entries:
+            component_id = entry.get("id") if isinstance(entry, dict) else None
+            if not isinstance(component_id, str) or not component_id:
+                errors.append(ValidationError(str(catalog_path), f"Entry without an id in {section}"))
+                continue
+            if component_id in in_catalog[section]:
+                errors.append(ValidationError(str(catalog_path), f"Duplicate id '{component_id}' in {section}"))
+            in_catalog[section].add(component_id)
+            if not isinstance(entry.get("path"), str) or not (repo_root / entry["path"]).exists():
+                errors.append(ValidationError(str(catalog_path), f"{section} '{component_id}' path does not exist: {entry.get('path')}"))
+        for component_id in sorted(on_disk[section] - in_catalog[section]):
+            errors.append(ValidationError(str(catalog_path), f"{section} '{component_id}' is not listed in catalog.json", "warning"))
+
+    # Presets name MCP ids without a platform
+    known = {section: ids for section, ids in in_catalog.items() if not section.startswith("mcp/")}
+    known["mcp"] = in_catalog["mcp/claude-code"] | in_catalog["mcp/claude-desktop"]
+    members = ["skills", "agents", "hooks", "commands", "mcp"]
+
+    def check_members(origin: str, preset_id: str, preset: Dict):
+        for section in members:
+            for component_id in as_list(preset.get(section)):
+                if isinstance(component_id, str) and component_id not in known[section]:
+                    errors.append(ValidationError(origin, f"Preset '{preset_id}' references {section} '{component_id}', which is not in catalog.json"))
+
+    catalog_presets = {}
+    for preset in as_list(catalog.get("presets")):
+        if not isinstance(preset, dict) or not isinstance(preset.get("id"), str):
+            continue
+        preset_id = preset["id"]
+        if preset_id in catalog_presets:
+            errors.append(ValidationError(str(catalog_path), f"Duplicate preset id '{preset_id}'"))
+        catalog_presets[preset_id] = preset
+        check_members(str(catalog_path), preset_id, preset)
+
+    manifests = set()
+    for manifest_path in sorted((repo_root / "presets").glob("*/manifest.json")):
+        preset_id = manifest_path.parent.name
+        manifests.add(preset_id)
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except json.JSONDecodeError as e:
+            errors.append(ValidationError(str(manifest_path), f"Invalid JSON: {e}"))
+            continue
+        errors.extend(schema_errors(check_manifest, manifest, manifest_path))
+        if not isinstance(manifest, dict):
+            continue
+        if manifest.get("name") != preset_id:
+            errors.append(ValidationError(str(manifest_path), f"Name '{manifest.get('name')}' doesn't match directory name '{preset_id}'", "warning"))
+        check_members(str(manifest_path), preset_id, manifest)
+        if preset_id not in catalog_presets:
+            errors.append(ValidationError(str(manifest_path), f"Preset '{preset_id}' is not listed in catalog.json", "warning"))
+            continue
+        for section in members:
+            listed = [i for i in as_list(manifest.get(section)) if isinstance(i, str)]
+            cataloged = [i for i in as_list(catalog_presets[preset_id].get(section)) if isinstance(i, str)]
+            if set(listed) != set(cataloged):
+                errors.append(ValidationError(str(manifest_path), f"Preset '{preset_id}' {section} differ from catalog.json", "warning"))
+
+    for preset_id in sorted(set(catalog_presets) - manifests):
+        errors.append(ValidationError(str(catalog_path), f"Preset '{preset_id}' has no presets/{preset_id}/manifest.json", "warning"))
 
     return errors
 
 
+def component_root(path: Path, section: str) -> Optional[Path]:
+    """Return the skills/<name> or hooks/<name> directory containing path."""
+    parts = path.parts
+    if section not in parts:
+        return None
+    i = len(parts) - 1 - parts[::-1].index(section)
+    return Path(*parts[:i + 2]) if len(parts) > i + 1 else None
+
+
 def validate_path(path: Path) -> List[ValidationError]:
     """Validate a specific path."""
     errors = []
 
+    # A file inside a skill or hook validates the whole component
+    for section, validator in (("skills", validate_skill), ("hooks", validate_hook)):
+        root = component_root(path, section)
+        if root is not None and root.is_dir():
+            return validator(root)
+
     if path.is_dir():
-        # Determine type by location
-        if "skills" in path.parts:
-            errors.extend(validate_skill(path))
-        elif "hooks" in path.parts:
-            errors.extend(validate_hook(path))
-        else:
-            errors.append(ValidationError(str(path), "Unknown component type for directory"))
+        errors.append(ValidationError(str(path), "Unknown component type for directory"))
     elif path.is_file():
         if "agents" in path.parts:
             errors.extend(validate_agent(path))
@@ -293,42 +979,203 @@ def validate_path(path: Path) -> List[ValidationError]:
     return errors
 
 
+def path_task(path: Path) -> Tuple[Callable[[Path], List[ValidationError]], Path]:
+    """Return the validation task for a path given on the command line.
+
+    A path inside a skill or hook becomes a task for the component's root
+    directory, so the task (and its cache entry) covers every file the
+    validator reads.
+    """
+    for section, validator in (("skills", validate_skill), ("hooks", validate_hook)):
+        root = component_root(path, section)
+        if root is not None and root.is_dir():
+            return validator, root
+    return validate_path, path
+
+
+# Component sections referenced by the catalog and preset manifests
+SECTIONS = ["skills", "agents", "hooks", "commands", "mcp"]
+
+
+def component_task(repo_root: Path, section: str, component_id: str) -> List[Tuple[Callable[[Path], List[ValidationError]], Path]]:
+    """Return the validation task(s) for a component referenced by id.
+
+    An MCP id can name a preset for both Claude Code and Claude Desktop.
+    Components that do not exist in the tree yield nothing.
+    """
+    if section == "skills":
+        candidates = [(validate_skill, repo_root / "skills" / component_id)]
+    elif section == "agents":
+        candidates = [(validate_agent, repo_root / "agents" / f"{component_id}.md")]
+    elif section == "hooks":
+        candidates = [(validate_hook, repo_root / "hooks" / component_id)]
+    elif section == "commands":
+        candidates = [(validate_command, repo_root / "commands" / f"{component_id}.md")]
+    elif section == "mcp":
+        candidates = [(validate_mcp_preset, repo_root / "mcp" / platform / f"{component_id}.json")
+                      for platform in ("claude-code", "claude-desktop")]
+    else:
+        return []
+    return [(validator, path) for validator, path in candidates if path.exists()]
+
+
+def file_task(repo_root: Path, rel_path: str) -> Optional[Tuple[Callable[[Path], List[ValidationError]], Path]]:
+    """Map a changed file to the component it belongs to, if any."""
+    parts = rel_path.split("/")
+    if len(parts) >= 2 and parts[0] in ("skills", "hooks"):
+        tasks = component_task(repo_root, parts[0], parts[1]) if len(parts) > 2 else []
+        return tasks[0] if tasks else None
+    if len(parts) == 2 and parts[0] in ("agents", "commands") and parts[1].endswith(".md") and parts[1] != "README.md":
+        tasks = component_task(repo_root, parts[0], parts[1][:-3])
+        return tasks[0] if tasks else None
+    if len(parts) == 3 and parts[0] == "mcp" and parts[2].endswith(".json"):
+        path = repo_root / rel_path
+        return (validate_mcp_preset, path) if path.exists() else None
+    return None
+
+
+def references(rel_path: str, data) -> Dict[Tuple[str, str], List[str]]:
+    """Return what a catalog or preset manifest says about each component it names.
+
+    This is the reverse dependency edge from the file to its components: a
+    component is affected when what the file says about it changes.
+    """
+    refs: Dict[Tuple[str, str], List[str]] = {}
+    if not isinstance(data, dict):
+        return refs
+
+    def add(section: str, component_id, reference: str):
+        if isinstance(component_id, str):
+            refs.setdefault((section, component_id), []).append(reference)
+
+    def add_preset(preset: Dict, name: str):
+        for section in SECTIONS:
+            members = preset.get(section, [])
+            if isinstance(members, list):
+                for component_id in members:
+                    add(section, component_id, f"preset:{name}")
+
+    if rel_path == "catalog.json":
+        components = data.get("components", {})
+        for section in SECTIONS:
+            groups = components.get(section, [])
+            # MCP entries are grouped by platform
+            if section == "mcp" and isinstance(groups, dict):
+                groups = [entry for entries in groups.values() for entry in entries]
+            for entry in groups if isinstance(groups, list) else []:
+                if isinstance(entry, dict):
+                    add(section, entry.get("id"), json.dumps(entry, sort_keys=True))
+        for preset in data.get("presets", []):
+            if isinstance(preset, dict):
+                add_preset(preset, str(preset.get("id")))
+    else:
+        add_preset(data, rel_path.split("/")[1])
+
+    return {key: sorted(value) for key, value in refs.items()}
+
+
+def is_reference_file(rel_path: str) -> bool:
+    parts = rel_path.split("/")
+    return rel_path == "catalog.json" or (len(parts) == 3 and parts[0] == "presets" and parts[2] == "manifest.json")
+
+
+def git(repo_root: Path, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], capture_output=True, text=True, cwd=repo_root)
+
+
+def merge_base(repo_root: Path, base: str) -> str:
+    """Return the merge-base of base and HEAD; raise ValueError if there is none."""
+    result = git(repo_root, "merge-base", base, "HEAD")
+    if result.returncode != 0:
+        raise ValueError(f"cannot find a merge-base with {base}: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def changed_files(repo_root: Path, commit: str) -> List[str]:
+    """Files changed between commit and the working tree.
+
+    Includes uncommitted and untracked files, so the same command works in CI
+    and before committing.
+    """
+    diff = git(repo_root, "diff", "--name-only", "--no-renames", "-z", commit)
+    untracked = git(repo_root, "ls-files", "--others", "--exclude-standard", "-z")
+    files = set(diff.stdout.split("\0")) | set(untracked.stdout.split("\0"))
+    files.discard("")
+    return sorted(files)
+
+
+def affected_tasks(repo_root: Path, base: str) -> List[Tuple[Callable[[Path], List[ValidationError]], Path]]:
+    """Validation tasks for every component affected by changes since base.
+
+    That is the components whose own files changed, plus the components whose
+    catalog entry or preset membership changed in catalog.json or a
+    presets/*/manifest.json. A change to this script can change any result,
+    so it affects every component. Raises ValueError if base cannot be
+    resolved.
+    """
+    tasks = {}
+    commit = merge_base(repo_root, base)
+    changed = changed_files(repo_root, commit)
+    if "scripts/validate.py" in changed:
+        return discover_components(repo_root)
+    for rel_path in changed:
+        task = file_task(repo_root, rel_path)
+        if task:
+            tasks[task[1]] = task
+        elif is_reference_file(rel_path):
+            old = git(repo_root, "show", f"{commit}:{rel_path}")
+            try:
+                old_refs = references(rel_path, json.loads(old.stdout)) if old.returncode == 0 else {}
+            except json.JSONDecodeError:
+                old_refs = {}
+            try:
+                new_refs = references(rel_path, json.loads((repo_root / rel_path).read_text()))
+            except (OSError, json.JSONDecodeError):
+                new_refs = {}
+            for key in old_refs.keys() | new_refs.keys():
+                if old_refs.get(key) != new_refs.get(key):
+                    for task in component_task(repo_root, *key):
+                        tasks[task[1]] = task
+    return [tasks[path] for path in sorted(tasks)]
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Validate Claude Code Community Extension components")
+    parser.add_argument("path", nargs="?", type=Path, help="Component to validate (default: all)")
+    parser.add_argument("--changed-only", action="store_true", dest="changed_only",
+                        help="Validate only components affected by changes since --base (for CI)")
+    parser.add_argument("--base", default="HEAD~1",
+                        help="Ref to compare against for --changed-only, via its merge-base with HEAD (default: HEAD~1)")
+    parser.add_argument("--references", action="store_true",
+                        help="Only check references between catalog.json, presets and components")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes (default: 1, 0 = one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", dest="no_cache",
+                        help="Revalidate every component instead of reusing cached results")
+    args = parser.parse_args()
+
     repo_root = Path(__file__).parent.parent
+    cache = None if args.no_cache else ValidationCache(repo_root / CACHE_PATH)
 
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--changed-only":
-            # Get changed files from git
-            import subprocess
-
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "HEAD~1"],
-                capture_output=True,
-                text=True,
-                cwd=repo_root,
-            )
-
-            changed_files = result.stdout.strip().split("\n")
-            errors = []
-
-            for file in changed_files:
-                if not file:
-                    continue
-                path = repo_root / file
-                if path.exists():
-                    errors.extend(validate_path(path))
-        elif sys.argv[1] == "--help":
-            print(__doc__)
-            sys.exit(0)
-        else:
-            # Validate specific path
-            path = Path(sys.argv[1])
-            if not path.is_absolute():
-                path = repo_root / path
-            errors = validate_path(path)
+    if args.changed_only:
+        try:
+            tasks = affected_tasks(repo_root, args.base)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        print(f"Validating {len(tasks)} component(s) affected since {args.base}")
+        errors = run_tasks(tasks, args.jobs, cache) + validate_references(repo_root)
+    elif args.references:
+        errors = validate_references(repo_root)
+    elif args.path:
+        # Validate specific path
+        path = args.path
+        if not path.is_absolute():
+            path = repo_root / path
+        errors = run_tasks([path_task(path)], args.jobs, cache)
     else:
         # Validate all
-        errors = validate_all(repo_root)
+        errors = validate_all(repo_root, args.jobs, cache)
 
     # Print results
     error_count = 0
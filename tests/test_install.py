@@ -0,0 +1,294 @@
+"""Tests for scripts/install.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import install  # noqa: E402
+from install import Installer  # noqa: E402
+
+
+def write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+
+
+def hook_settings(command: str, matcher: str = 'Bash') -> dict:
+    return {'hooks': {'PostToolUse': [{'matcher': matcher, 'hooks': [{'type': 'command', 'command': command}]}]}}
+
+
+def settings_commands(settings_path: Path) -> list:
+    settings = json.loads(settings_path.read_text())
+    return sorted(
+        handler['command']
+        for groups in settings.get('hooks', {}).values()
+        for group in groups
+        for handler in group['hooks']
+    )
+
+
+class InstallerTestCase(unittest.TestCase):
+    """Builds a small extensions repo and a project target in a temp directory."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.repo = self.root / 'repo'
+        self.catalog = {
+            'version': '1.0.0',
+            'components': {'skills': [], 'agents': [], 'hooks': [], 'commands': [],
+                           'mcp': {'claude-code': [], 'claude-desktop': []}},
+            'presets': [],
+        }
+        self.project = self.root / 'project'
+        self.project.mkdir()
+        self.target = self.project / '.claude'
+
+    def add_hook(self, hook_id: str, command: str, matcher: str = 'Bash'):
+        write_json(self.repo / 'hooks' / hook_id / 'settings.json', hook_settings(command, matcher))
+        self.catalog['components']['hooks'].append({
+            'id': hook_id, 'name': hook_id, 'description': '', 'path': f"hooks/{hook_id}", 'version': '1.0.0',
+        })
+
+    def add_skill(self, skill_id: str, body: str = 'Guidance.'):
+        skill_dir = self.repo / 'skills' / skill_id
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        (skill_dir / 'SKILL.md').write_text(f"---\nname: {skill_id}\ndescription: Test skill\n---\n\n{body}\n")
+        self.catalog['components']['skills'].append({
+            'id': skill_id, 'name': skill_id, 'description': '', 'path': f"skills/{skill_id}", 'version': '1.0.0',
+        })
+
+    def add_agent(self, agent_id: str, body: str = 'Instructions.'):
+        (self.repo / 'agents').mkdir(parents=True, exist_ok=True)
+        (self.repo / 'agents' / f"{agent_id}.md").write_text(
+            f"---\nname: {agent_id}\ndescription: Test agent\n---\n\n{body}\n")
+        self.catalog['components']['agents'].append({
+            'id': agent_id, 'name': agent_id, 'description': '', 'path': f"agents/{agent_id}.md", 'version': '1.0.0',
+        })
+
+    def add_mcp(self, preset_id: str, server: str):
+        write_json(self.repo / 'mcp' / 'claude-code' / f"{preset_id}.json",
+                   {'mcpServers': {server: {'command': 'npx', 'args': [server]}}})
+        self.catalog['components']['mcp']['claude-code'].append({
+            'id': preset_id, 'name': preset_id, 'description': '', 'path': f"mcp/claude-code/{preset_id}.json",
+            'version': '1.0.0',
+        })
+
+    def installer(self) -> Installer:
+        write_json(self.repo / 'catalog.json', self.catalog)
+        installer = Installer(self.repo)
+        installer.no_backup = True
+        installer.jobs = 1
+        return installer
+
+    def install_hooks(self, *hook_ids: str):
+        installer = self.installer()
+        installer.selected_hooks = set(hook_ids)
+        report = installer.do_install(self.target, 'project', 'copy')
+        self.assertTrue(report.ok, report.results)
+
+
+class HookReplacementTest(InstallerTestCase):
+
+    def test_sync_replaces_edited_hook_command(self):
+        self.add_hook('formatter', 'echo old')
+        self.install_hooks('formatter')
+
+        write_json(self.repo / 'hooks' / 'formatter' / 'settings.json', hook_settings('echo new'))
+        results = self.installer().sync_changes({self.repo / 'hooks' / 'formatter' / 'settings.json'})
+
+        self.assertEqual([(r.component_id, r.path) for r in results], [('formatter', 'settings.json')])
+        self.assertEqual(settings_commands(self.target / 'settings.json'), ['echo new'])
+
+    def test_sync_keeps_user_and_other_hook_handlers(self):
+        self.add_hook('formatter', 'echo old')
+        self.add_hook('logger', 'echo log')
+        self.install_hooks('formatter', 'logger')
+
+        settings = json.loads((self.target / 'settings.json').read_text())
+        settings['hooks']['PostToolUse'][0]['hooks'].append({'type': 'command', 'command': 'echo mine'})
+        write_json(self.target / 'settings.json', settings)
+
+        write_json(self.repo / 'hooks' / 'formatter' / 'settings.json', hook_settings('echo new', 'Edit'))
+        self.installer().sync_changes()
+
+        self.assertEqual(settings_commands(self.target / 'settings.json'), ['echo log', 'echo mine', 'echo new'])
+
+    def test_removed_handler_leaves_no_empty_group(self):
+        self.add_hook('formatter', 'echo old', matcher='Edit')
+        self.install_hooks('formatter')
+
+        write_json(self.repo / 'hooks' / 'formatter' / 'settings.json', hook_settings('echo new', 'Bash'))
+        self.installer().sync_changes()
+
+        groups = json.loads((self.target / 'settings.json').read_text())['hooks']['PostToolUse']
+        self.assertEqual([group['matcher'] for group in groups], ['Bash'])
+
+    def test_update_replaces_edited_hook_command(self):
+        self.add_hook('formatter', 'echo old')
+        self.install_hooks('formatter')
+        self.git('init', '-q')
+        self.git('add', '-A')
+        self.git('commit', '-q', '-m', 'base')
+
+        write_json(self.repo / 'hooks' / 'formatter' / 'settings.json', hook_settings('echo new'))
+        self.git('commit', '-q', '-am', 'edit hook')
+        report = self.installer().update_from('HEAD~1')
+
+        self.assertEqual(report.affected, [('hooks', 'formatter')])
+        self.assertEqual(settings_commands(self.target / 'settings.json'), ['echo new'])
+
+    def git(self, *args: str):
+        subprocess.run(['git', '-C', str(self.repo), '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                        *args], check=True)
+
+
+class LockFileTest(InstallerTestCase):
+
+    def test_locks_stay_inside_the_backup_directory(self):
+        self.add_hook('formatter', 'echo fmt')
+        self.add_mcp('search', 'search-server')
+        installer = self.installer()
+        installer.no_backup = False
+        installer.selected_hooks = {'formatter'}
+        installer.selected_mcp = {'search'}
+        installer.do_install(self.target, 'project', 'copy')
+        installer.force = True
+        installer.do_install(self.target, 'project', 'copy')  # backs up the merged configs
+
+        locks = sorted(path.relative_to(self.project).as_posix() for path in self.project.rglob('*.lock'))
+        self.assertEqual(locks, [
+            '.claude/.backups/locks/.install-state.json.lock',
+            '.claude/.backups/locks/.mcp.json.lock',
+            '.claude/.backups/locks/index.json.lock',
+            '.claude/.backups/locks/settings.json.lock',
+        ])
+
+
+class BackupTest(InstallerTestCase):
+
+    def test_backups_in_the_same_second_are_all_kept(self):
+        write_json(self.target / 'settings.json', {'hooks': {}})
+        installer = self.installer()
+        installer.no_backup = False
+        for backup_format in ('store', 'store', 'store', 'archive', 'archive'):
+            installer.backup_format = backup_format
+            installer.create_backup(self.target)
+
+        backups = installer.list_backups(self.target)
+        self.assertEqual(len(backups), 5)
+        self.assertEqual(len({backup.backup_id for backup in backups}), 5)
+        self.assertEqual(sorted(b.format for b in backups), ['archive', 'archive', 'store', 'store', 'store'])
+
+    def test_reinstall_takes_one_backup_for_all_mode_batches(self):
+        self.add_skill('writer')
+        self.add_agent('reviewer')
+        installer = self.installer()
+        installer.reinstall(self.target, 'project', [('skill', 'writer', 'copy'), ('agent', 'reviewer', 'symlink')])
+
+        installer.no_backup = False
+        reports = installer.reinstall(self.target, 'project', [('skill', 'writer', 'copy'),
+                                                               ('agent', 'reviewer', 'symlink')], force=True)
+
+        self.assertEqual([report.backup is not None for report in reports], [True, False])
+        self.assertEqual(len(installer.list_backups(self.target)), 1)
+
+
+class VerifyTest(InstallerTestCase):
+
+    def test_symlink_install_follows_source_edits(self):
+        self.add_skill('writer')
+        installer = self.installer()
+        installer.reinstall(self.target, 'project', [('skill', 'writer', 'symlink')])
+
+        (self.repo / 'skills' / 'writer' / 'SKILL.md').write_text("---\nname: writer\ndescription: New\n---\n")
+        results = self.installer().verify_install(self.target)
+
+        self.assertEqual([(r.component_id, r.status) for r in results], [('writer', 'ok')])
+        entry = self.installer().load_install_state(self.target)['components']['skill:writer']
+        self.assertEqual(entry['files']['SKILL.md']['sha256'],
+                         install.file_sha256(self.repo / 'skills' / 'writer' / 'SKILL.md'))
+
+    def test_copy_install_reports_source_edits(self):
+        self.add_skill('writer')
+        installer = self.installer()
+        installer.reinstall(self.target, 'project', [('skill', 'writer', 'copy')])
+
+        (self.repo / 'skills' / 'writer' / 'SKILL.md').write_text("---\nname: writer\ndescription: New\n---\n")
+        results = self.installer().verify_install(self.target)
+
+        self.assertEqual([(r.component_id, r.status, r.reason) for r in results],
+                         [('writer', 'outdated', 'source SKILL.md changed')])
+
+    def test_repair_backs_up_local_edits_across_modes(self):
+        self.add_skill('writer')
+        self.add_agent('reviewer')
+        installer = self.installer()
+        installer.reinstall(self.target, 'project', [('skill', 'writer', 'copy'), ('agent', 'reviewer', 'symlink')])
+
+        skill_file = self.target / 'skills' / 'writer' / 'SKILL.md'
+        skill_file.write_text("my local edit\n")
+        (self.target / 'agents' / 'reviewer.md').unlink()
+
+        installer = self.installer()
+        installer.no_backup = False
+        results = installer.verify_install(self.target)
+        self.assertEqual(sorted((r.component_id, r.status) for r in results),
+                         [('reviewer', 'missing'), ('writer', 'modified')])
+        reports = installer.repair_install(self.target, results)
+        self.assertTrue(all(report.ok for report in reports))
+        self.assertNotEqual(skill_file.read_text(), "my local edit\n")
+
+        restored = installer.restore_backup(self.target, only=['skills/writer'])
+        self.assertTrue(restored.ok, restored.error)
+        self.assertEqual(skill_file.read_text(), "my local edit\n")
+
+
+class FleetLockfileTest(InstallerTestCase):
+
+    def test_bad_entries_fail_without_stopping_the_fleet(self):
+        self.add_hook('formatter', 'echo fmt')
+        (self.root / 'other').mkdir()
+        lockfile = self.root / 'fleet.json'
+        write_json(lockfile, {
+            'defaults': {'hooks': ['formatter']},
+            'projects': [
+                {'path': 'project', 'mode': 'cpoy'},
+                {'mode': 'copy'},
+                {'path': 'other', 'mode': 'copy'},
+                42,
+            ],
+        })
+
+        results = self.installer().run_fleet(lockfile)
+
+        self.assertEqual([r.ok for r in results], [False, False, True, False])
+        self.assertIn("unknown mode 'cpoy'", results[0].error)
+        self.assertEqual(results[0].path, self.project)
+        self.assertEqual(results[1].error, "missing 'path'")
+        self.assertEqual(results[3].error, 'project entry must be an object or a path string')
+        self.assertFalse(self.target.exists())
+        self.assertEqual(settings_commands(self.root / 'other' / '.claude' / 'settings.json'), ['echo fmt'])
+
+    def test_string_entry_is_a_project_path(self):
+        self.add_hook('formatter', 'echo fmt')
+        lockfile = self.root / 'fleet.json'
+        write_json(lockfile, {'defaults': {'hooks': ['formatter'], 'mode': 'copy'}, 'projects': ['project']})
+
+        results = self.installer().run_fleet(lockfile)
+
+        self.assertEqual([(r.path, r.ok) for r in results], [(self.project, True)])
+        self.assertEqual(settings_commands(self.target / 'settings.json'), ['echo fmt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Tests for scripts/validate.py.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_DIR / 'scripts'))
+
+import validate  # noqa: E402
+from validate import ValidationCache, path_task, run_tasks  # noqa: E402
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Frontmatter headers covering the flat fast path and the YAML fallbacks
+FRONTMATTER_CASES = [
+    "name: my-skill\ndescription: Does things. Triggers on \"x\", 'y'.\nallowed-tools: Bash, Read\n",
+    "name: a\r\ndescription: windows line endings\r\n",
+    "# comment\nname: a\n\n  # indented comment\nmodel: haiku\n",
+    "name: a\nname: b\n",
+    "url: https://example.com/a:b\n",
+    "description: 50% off & more!\n",
+    "description: trailing spaces   \n",
+    "description: tab\tinside\n",
+    "version: 1.0.0\n",
+    "version: 1.0\n",
+    "count: 12\n",
+    "enabled: yes\n",
+    "enabled: On\n",
+    "answer: n\n",
+    "value: ~\n",
+    "value: null\n",
+    "value:\n",
+    "date: 2025-01-01\n",
+    "yes: key is a boolean\n",
+    "description: a: b\n",
+    "description: value # comment\n",
+    "description: ends with colon:\n",
+    "description: \"quoted\"\n",
+    "description: 'single'\n",
+    "tools: [Bash, Read]\n",
+    "description: >\n  folded\n  text\n",
+    "description: |\n  literal\n",
+    "list:\n  - a\n  - b\n",
+    "description: -dash\n",
+    "description: .hidden\n",
+    "description: *alias\n",
+    "description: !tag\n",
+    "description: ünïcödé ✓\n",
+    "just a string\n",
+    "",
+    "# only a comment\n",
+]
+
+
+class ValidatorTestCase(unittest.TestCase):
+    """Copies a real skill into a scratch repository."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.skill = self.root / 'skills' / 'testing-assistant'
+        shutil.copytree(REPO_DIR / 'skills' / 'testing-assistant', self.skill)
+
+    def git(self, *args: str):
+        subprocess.run(['git', '-C', str(self.root), '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                        *args], check=True, capture_output=True)
+
+
+class PathTaskTest(ValidatorTestCase):
+
+    def test_file_inside_skill_validates_the_skill(self):
+        self.assertEqual(path_task(self.skill / 'README.md'), (validate.validate_skill, self.skill))
+
+    def test_cache_sees_changes_to_other_files_of_the_component(self):
+        cache_path = self.root / '.cache' / 'validation.json'
+        task = path_task(self.skill / 'README.md')
+        self.assertEqual(run_tasks([task], cache=ValidationCache(cache_path)), [])
+
+        (self.skill / 'SKILL.md').write_text("# No frontmatter\n")
+        errors = run_tasks([path_task(self.skill / 'README.md')], cache=ValidationCache(cache_path))
+
+        self.assertTrue(any(error.severity == 'error' for error in errors), errors)
+
+
+class ChangedOnlyTest(ValidatorTestCase):
+
+    def test_validator_change_affects_every_component(self):
+        (self.root / 'scripts').mkdir()
+        shutil.copy(REPO_DIR / 'scripts' / 'validate.py', self.root / 'scripts' / 'validate.py')
+        self.git('init', '-q')
+        self.git('add', '-A')
+        self.git('commit', '-q', '-m', 'base')
+        self.assertEqual(validate.affected_tasks(self.root, 'HEAD'), [])
+
+        with open(self.root / 'scripts' / 'validate.py', 'a') as f:
+            f.write("\n")
+
+        self.assertEqual(validate.affected_tasks(self.root, 'HEAD'), validate.discover_components(self.root))
+        self.assertIn((validate.validate_skill, self.skill), validate.affected_tasks(self.root, 'HEAD'))
+
+
+@unittest.skipIf(yaml is None, 'PyYAML is not installed')
+class FrontmatterParityTest(unittest.TestCase):
+    """The flat frontmatter parser must agree with PyYAML wherever it is used."""
+
+    def assert_parity(self, text: str):
+        loaders = [yaml.SafeLoader] + ([yaml.CSafeLoader] if hasattr(yaml, 'CSafeLoader') else [])
+        try:
+            expected = [yaml.load(text, Loader=loader) for loader in loaders]
+        except yaml.YAMLError:
+            return
+        fast = validate.parse_flat_header(text)
+        if fast is not None:
+            for result in expected:
+                self.assertEqual(fast, result)
+        self.assertEqual(validate.parse_header(text), expected[0])
+
+    def test_crafted_headers(self):
+        for text in FRONTMATTER_CASES:
+            with self.subTest(text=text):
+                self.assert_parity(text)
+
+    def test_repository_headers(self):
+        paths = [p for p in sorted(REPO_DIR.rglob('*.md')) if '.cache' not in p.parts]
+        for path in paths:
+            match = re.match(r"---[ \t]*\r?\n(.*?)^---[ \t]*\r?$", path.read_text(), re.DOTALL | re.MULTILINE)
+            if match:
+                with self.subTest(path=str(path.relative_to(REPO_DIR))):
+                    self.assert_parity(match.group(1))
+
+
+if __name__ == '__main__':
+    unittest.main()